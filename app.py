@@ -1,14 +1,32 @@
 """
 Daily Trivia App
-A minimalist trivia application with Google Sheets integration.
+A minimalist trivia application with Google Sheets (or local SQLite) storage.
 Features: Global History, Advanced Stats, Streak Tracking, Hall of Fame
 """
 
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
+import numpy as np
+import pyarrow as pa
 from datetime import datetime, timedelta
+import atexit
+import bisect
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+import functools
+import hashlib
+import hmac
+import heapq
+import json
+import os
+import random
+import sqlite3
+import threading
 import time
+import uuid
+from gspread.exceptions import APIError, WorksheetNotFound
 from streamlit_gsheets import GSheetsConnection
 
 # ============================================================================
@@ -16,7 +34,26 @@ from streamlit_gsheets import GSheetsConnection
 # ============================================================================
 NUM_QUESTIONS = 5  # Change this to 10 if you want more questions
 TIMER_SECONDS = 60  # Change this to adjust quiz duration
-QUIZ_DAYS = [0, 4]  # Monday=0, Friday=4 (days quizzes are released)
+QUIZ_DAYS = [0, 4]  # Monday=0, Friday=4 (days quizzes are released; each play window runs to the next)
+STORAGE_BACKEND = "gsheets"  # "gsheets" or "sqlite" (local, indexed; synced to Sheets)
+SQLITE_PATH = "trivia.db"  # Database file used when STORAGE_BACKEND = "sqlite" (relative to app.py)
+SHEETS_SYNC_SECONDS = 300  # How often the SQLite backend syncs with Google Sheets
+WRITE_FLUSH_SECONDS = 2  # Max time a submitted score waits in the write queue
+WRITE_BATCH_SIZE = 25  # Flush early once this many rows are queued
+WRITE_MAX_BACKOFF_SECONDS = 60  # Cap for the retry backoff after a failed flush
+HISTORY_REFRESH_SECONDS = 5  # How often new Global_History rows are fetched
+HISTORY_FULL_RELOAD_SECONDS = 3600  # Full re-download, in case rows were edited by hand
+HISTORY_SNAPSHOT_PATH = "global_history.arrow"  # Local columnar copy for fast cold starts (relative to app.py); empty = off
+HISTORY_SNAPSHOT_SECONDS = 60  # Min time between snapshot rewrites
+LEADERBOARD_FULL_RELOAD_SECONDS = 300  # Full re-download, which also rotates out past windows
+ROTATE_LEADERBOARD = True  # Delete past windows' Leaderboard rows (Global_History keeps every score); one process only
+STATS_CACHE_MAX_ENTRIES = 16  # Computed Hall of Fame tables kept in memory
+QUESTION_BANK_REFRESH_SECONDS = 60  # How often the Questions sheet is checked for edits
+LOG_ANSWERS = True  # Record each game's answers (Answers sheet) for question difficulty stats
+EDITOR_TOKEN_SECRET = "editor_token"  # st.secrets key; editors open ?view=questions&token=<it>. Unset = view off
+QUIZ_MODE = "window"  # "window" (everyone in a play window gets the same quiz) or "random" (per player)
+METRICS_EXPORT_PATH = ""  # e.g. "metrics.prom" (Prometheus text) or "metrics.json"; empty = off
+METRICS_EXPORT_SECONDS = 15  # How often the metrics snapshot is written
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -31,899 +68,2595 @@ st.set_page_config(
 # ============================================================================
 # CUSTOM CSS - With Background Image
 # ============================================================================
-# NOTE: Upload background.jpeg to your GitHub repo and update this URL
+# NOTE: The background is served locally from static/ once built with
+# scripts/build_background.py; this URL is only the fallback without that build
 # Example: https://raw.githubusercontent.com/YOUR_USERNAME/daily-trivia/main/background.jpeg
 BACKGROUND_IMAGE_URL = "https://raw.githubusercontent.com/stephenvdavis-jpg/daily-trivia/main/background.jpeg"
 
-st.markdown("""
-<style>
-    /* Import Helvetica-like font */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Global styles */
-    html, body, [class*="css"] {
-        font-family: 'Inter', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-    }
-    
-    /* Headers */
-    h1, h2, h3, .stMarkdown h1, .stMarkdown h2, .stMarkdown h3 {
-        font-weight: 600;
-        color: #000000 !important;
-        letter-spacing: -0.02em;
-    }
-    
-    /* Main title styling */
-    .main-title {
-        font-size: 2.5rem;
-        font-weight: 700;
-        text-align: center;
-        margin-bottom: 0.5rem;
-        color: #000000 !important;
-        background: transparent !important;
-    }
-    
-    .subtitle {
-        font-size: 1rem;
-        text-align: center;
-        color: #666666 !important;
-        margin-bottom: 2rem;
-        background: transparent !important;
-    }
-    
-    /* ========== TIMER DISPLAY - FORCE WHITE TEXT ========== */
-    .timer-container,
-    div.timer-container {
-        background-color: #000000 !important;
-        color: #ffffff !important;
-        padding: 1rem 2rem;
-        border-radius: 8px;
-        text-align: center;
-        font-size: 2rem;
-        font-weight: 700;
-        margin: 1rem 0;
-        font-variant-numeric: tabular-nums;
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(APP_DIR, 'static')
+
+
+@st.cache_resource
+def get_static_version(name):
+    """Short content hash of a static file, so browsers refetch it only when it changes."""
+    path = os.path.join(STATIC_DIR, name)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()[:10]
+
+
+# The theme is a static file (server.enableStaticServing in .streamlit/config.toml):
+# each rerun sends a one-line <link> and the browser caches the stylesheet itself
+st.markdown(
+    f'<link rel="stylesheet" href="app/static/theme.css?v={get_static_version("theme.css")}">',
+    unsafe_allow_html=True
+)
+
+# Background: responsive AVIF/WebP variants over a blurred placeholder, built
+# from background.jpeg by scripts/build_background.py. Without the build
+# output, fall back to the configured image URL.
+if get_static_version("background.css"):
+    st.markdown(
+        f'<link rel="stylesheet" href="app/static/background.css?v={get_static_version("background.css")}">',
+        unsafe_allow_html=True
+    )
+else:
+    st.markdown(f"""
+    <style>
+        .stApp, [data-testid="stAppViewContainer"] {{
+            background-image: url('{BACKGROUND_IMAGE_URL}');
+        }}
+    </style>
+    """, unsafe_allow_html=True)
+
+
+# ============================================================================
+# SESSION STATE INITIALIZATION
+# ============================================================================
+def init_session_state():
+    """Initialize all session state variables."""
+    defaults = {
+        'player_name': '',
+        'game_started': False,
+        'start_time': None,
+        'questions': None,
+        'quiz_payload': None,
+        'answers': {},
+        'submitted': False,
+        'score': 0,
+        'time_taken': 0,
+        'connection_error': None,
+        'questions_total': NUM_QUESTIONS,
+        'submission_id': None,
+        'score_saved': False
     }
+    for key, value in defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+class Metrics:
+    """
+    Process-wide counters and latency histograms.
     
-    .timer-container *,
-    div.timer-container * {
-        color: #ffffff !important;
-    }
+    Snapshots are exported as Prometheus text or JSON (see METRICS_EXPORT_PATH)
+    so slow pages can be traced to Sheets I/O, pandas work or rerun volume.
+    """
     
-    .timer-warning,
-    div.timer-warning {
-        background-color: #333333 !important;
-        animation: pulse 1s infinite;
-    }
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}  # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+    
+    def inc(self, name, amount=1, **labels):
+        """Increment a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+    
+    def observe(self, name, seconds, **labels):
+        """Record a duration in a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.setdefault(key, [0] * (len(self.BUCKETS) + 2))
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    histogram[i] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+    
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time the enclosed block into a histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+    
+    def cache_result(self, cache, hit):
+        """Count a cache hit or miss."""
+        self.inc('cache_requests_total', cache=cache, result='hit' if hit else 'miss')
+    
+    def to_prometheus(self):
+        """Render a Prometheus text-format snapshot."""
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+        
+        with self.lock:
+            counters = dict(self.counters)
+            histograms = {key: list(values) for key, values in self.histograms.items()}
+        
+        lines = []
+        for name in sorted({name for name, _ in counters}):
+            lines.append(f'# TYPE trivia_{name} counter')
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'trivia_{name}{fmt(labels)} {value}')
+        for name in sorted({name for name, _ in histograms}):
+            lines.append(f'# TYPE trivia_{name} histogram')
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                for bound, count in zip(self.BUCKETS, values):
+                    lines.append(f'trivia_{name}_bucket{fmt(labels, [("le", bound)])} {count}')
+                lines.append(f'trivia_{name}_bucket{fmt(labels, [("le", "+Inf")])} {values[-1]}')
+                lines.append(f'trivia_{name}_sum{fmt(labels)} {values[-2]:.6f}')
+                lines.append(f'trivia_{name}_count{fmt(labels)} {values[-1]}')
+        return '\n'.join(lines) + '\n'
+    
+    def to_json(self):
+        """Render a JSON-serializable snapshot, including cache hit rates."""
+        with self.lock:
+            counters = dict(self.counters)
+            histograms = {key: list(values) for key, values in self.histograms.items()}
+        
+        snapshot = {
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'counters': [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+            'histograms': [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'count': values[-1],
+                    'sum': values[-2],
+                    'mean': values[-2] / values[-1] if values[-1] else 0,
+                    'buckets': dict(zip([str(b) for b in self.BUCKETS], values[:-2]))
+                }
+                for (name, labels), values in sorted(histograms.items())
+            ],
+            'cache_hit_rates': {}
+        }
+        
+        requests = {}
+        for (name, labels), value in counters.items():
+            if name == 'cache_requests_total':
+                labels = dict(labels)
+                hits, total = requests.get(labels['cache'], (0, 0))
+                requests[labels['cache']] = (hits + (value if labels['result'] == 'hit' else 0), total + value)
+        for cache, (hits, total) in sorted(requests.items()):
+            snapshot['cache_hit_rates'][cache] = round(hits / total, 4) if total else None
+        
+        return snapshot
     
-    .timer-warning *,
-    div.timer-warning * {
-        color: #ffffff !important;
-    }
+    def export(self, path):
+        """Write a snapshot to path (.json for JSON, anything else for Prometheus text)."""
+        if path.endswith('.json'):
+            content = json.dumps(self.to_json(), indent=2)
+        else:
+            content = self.to_prometheus()
+        
+        # Write then rename so scrapers never see a half-written file
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
 
-    @keyframes pulse {
-        0%, 100% { opacity: 1; }
-        50% { opacity: 0.7; }
-    }
-    
-    /* Question cards */
-    .question-card {
-        background-color: #f8f8f8 !important;
-        border: 1px solid #e0e0e0;
-        border-radius: 8px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-    }
-    
-    .question-number {
-        font-size: 0.875rem;
-        font-weight: 600;
-        color: #666666 !important;
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-        margin-bottom: 0.5rem;
-    }
+
+@st.cache_resource
+def get_metrics():
+    """Create the process-wide metrics registry and start the exporter."""
+    metrics = Metrics()
+    
+    if METRICS_EXPORT_PATH:
+        def export_loop():
+            while True:
+                time.sleep(METRICS_EXPORT_SECONDS)
+                try:
+                    metrics.export(METRICS_EXPORT_PATH)
+                except Exception:
+                    pass  # Metrics must never break the app
+        
+        threading.Thread(target=export_loop, daemon=True).start()
+        atexit.register(metrics.export, METRICS_EXPORT_PATH)
     
-    .question-text {
-        font-size: 1.125rem;
-        font-weight: 500;
-        color: #000000 !important;
-        margin-bottom: 1rem;
+    return metrics
+
+
+def timed(func):
+    """Record each call of func in the function_seconds histogram."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with get_metrics().timer('function_seconds', function=func.__qualname__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def timed_storage(op):
+    """Record a storage method's latency, labelled by backend, op and worksheet."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, worksheet, *args, **kwargs):
+            with get_metrics().timer('storage_seconds', backend=self.name, op=op, worksheet=worksheet):
+                return method(self, worksheet, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ============================================================================
+# STORAGE BACKENDS
+# ============================================================================
+# Column layout of each worksheet / table, with the SQLite type of each column
+TABLE_SCHEMAS = {
+    'Questions': {
+        'Question': 'TEXT',
+        'Option_A': 'TEXT',
+        'Option_B': 'TEXT',
+        'Option_C': 'TEXT',
+        'Option_D': 'TEXT',
+        'Correct_Answer': 'TEXT'
+    },
+    'Leaderboard': {
+        'Name': 'TEXT',
+        'Score': 'INTEGER',
+        'Time_Taken': 'INTEGER',
+        'Timestamp': 'TEXT',
+        'Submission_ID': 'TEXT',
+        'Window': 'TEXT'
+    },
+    'Global_History': {
+        'Name': 'TEXT',
+        'Score': 'INTEGER',
+        'Time_Taken': 'INTEGER',
+        'Questions_Total': 'INTEGER',
+        'Timestamp': 'TEXT',
+        'Date': 'TEXT',
+        'Submission_ID': 'TEXT'
+    },
+    'Answers': {
+        'Submission_ID': 'TEXT',
+        'Name': 'TEXT',
+        'Window': 'TEXT',
+        'Question_IDs': 'TEXT',
+        'Answers': 'TEXT',
+        'Correct': 'TEXT',
+        'Timestamp': 'TEXT'
+    },
+    'Quiz_Sets': {
+        'Window': 'TEXT',
+        'Question_IDs': 'TEXT',
+        'Created': 'TEXT'
     }
+}
+
+HISTORY_COLUMNS = list(TABLE_SCHEMAS['Global_History'])
+
+# Secondary indexes created by the SQLite backend: (table, column)
+TABLE_INDEXES = [
+    ('Leaderboard', 'Name'),
+    ('Global_History', 'Name'),
+    ('Global_History', 'Date'),
+    ('Quiz_Sets', 'Window')
+]
+
+# Score tables carry a Submission_ID so retried writes can't create duplicates
+SUBMISSION_TABLES = ('Leaderboard', 'Global_History', 'Answers')
+EDITORIAL_TABLES = ('Questions', 'Quiz_Sets')  # Maintained in Sheets; the SQLite backend pulls them
+
+
+class StorageBackend:
+    """
+    Interface shared by all storage backends.
     
-    /* ========== BUTTONS - FORCE WHITE TEXT ========== */
-    .stButton > button,
-    .stButton button,
-    [data-testid="stButton"] button,
-    [data-testid="baseButton-secondary"],
-    [data-testid="baseButton-primary"] {
-        background-color: #000000 !important;
-        color: #ffffff !important;
-        border: none !important;
-        border-radius: 6px;
-        padding: 0.75rem 2rem;
-        font-weight: 500;
-        font-size: 1rem;
-        transition: all 0.2s ease;
-        width: 100%;
-    }
+    Worksheets are addressed by name ("Questions", "Leaderboard",
+    "Global_History") and exchanged as DataFrames for reads and lists of
+    row dicts for appends.
+    """
     
-    /* Button text specifically */
-    .stButton > button *,
-    .stButton button *,
-    [data-testid="stButton"] button *,
-    .stButton > button p,
-    .stButton > button span {
-        color: #ffffff !important;
-    }
+    def read(self, worksheet, ttl=None, **options):
+        """Return the full contents of a worksheet as a DataFrame."""
+        raise NotImplementedError
     
-    .stButton > button:hover,
-    .stButton button:hover,
-    [data-testid="stButton"] button:hover {
-        background-color: #333333 !important;
-        color: #ffffff !important;
-    }
+    def append(self, worksheet, entries):
+        """Append rows (a list of dicts) to the end of a worksheet."""
+        raise NotImplementedError
     
-    .stButton > button:hover * {
-        color: #ffffff !important;
-    }
+    def append_unique(self, worksheet, entries):
+        """
+        Append only the rows whose Submission_ID isn't stored yet.
+        
+        Used when retrying a write that may already have landed. This fallback
+        reads the whole worksheet to find the stored IDs.
+        """
+        df = self.read(worksheet, ttl=0)
+        stored = set()
+        if df is not None and 'Submission_ID' in df.columns:
+            stored = set(df['Submission_ID'].dropna())
+        entries = [entry for entry in entries if entry.get('Submission_ID') not in stored]
+        if entries:
+            self.append(worksheet, entries)
+    
+    def delete_first_rows(self, worksheet, n_rows):
+        """Delete the oldest n_rows data rows of a worksheet."""
+        raise NotImplementedError
+    
+    def read_since(self, worksheet, watermark):
+        """
+        Return (rows added after watermark, new watermark).
+        
+        A watermark of 0 means "from the beginning". This fallback reads the
+        whole worksheet; backends override it to fetch only the new rows.
+        """
+        df = self.read(worksheet, ttl=0)
+        if df is None:
+            return pd.DataFrame(), watermark
+        return df.iloc[watermark:], len(df)
+    
+    def read_first(self, worksheet, n_rows):
+        """Return the oldest n_rows data rows, in the same form as read_since()."""
+        df = self.read(worksheet, ttl=0)
+        if df is None:
+            return pd.DataFrame()
+        return df.iloc[:n_rows]
+    
+    def identity(self):
+        """Name the data behind this backend, e.g. which spreadsheet or database file."""
+        return getattr(self, 'name', '')
 
-    /* Input fields */
-    .stTextInput > div > div > input {
-        border: 2px solid #000000 !important;
-        border-radius: 6px;
-        padding: 0.75rem;
-        font-size: 1rem;
-        background-color: #ffffff !important;
-        color: #000000 !important;
-    }
+
+class SheetsStorage(StorageBackend):
+    """Storage backed directly by the Google Sheets connection."""
     
-    /* Placeholder text color */
-    .stTextInput > div > div > input::placeholder {
-        color: #666666 !important;
-        opacity: 1 !important;
-    }
+    name = 'sheets'
     
-    .stTextInput > div > div > input:focus {
-        border-color: #000000 !important;
-        box-shadow: 0 0 0 1px #000000;
-    }
+    def __init__(self, conn):
+        self.conn = conn
     
-    /* ========== RADIO BUTTONS - CRITICAL FIX ========== */
-    .stRadio > div {
-        background-color: transparent !important;
-    }
+    @contextmanager
+    def _worksheet(self, worksheet, create=False):
+        """
+        Yield the gspread Worksheet behind a worksheet name, optionally
+        adding it if it doesn't exist.
+        
+        Worksheets are looked up once and kept in get_worksheet_handles(), so
+        appends and incremental reads don't re-open the spreadsheet (an extra
+        metadata request) every time. A call that fails with an API error or
+        a missing worksheet drops the handle; the next one looks it up again.
+        
+        This and identity() are the only places that reach into
+        st-gsheets-connection's client internals (_select_worksheet,
+        _open_spreadsheet, _spreadsheet). Its public read()/update() always
+        transfer whole worksheets, while appends, partial reads and row deletes
+        need the Worksheet itself. If a connection upgrade renames these, only
+        these methods need changing.
+        """
+        handles = get_worksheet_handles()
+        key = (self.conn.client, worksheet)
+        sheet = handles.get(key)
+        get_metrics().cache_result('worksheet', hit=sheet is not None)
+        if sheet is None:
+            try:
+                sheet = self.conn.client._select_worksheet(worksheet=worksheet)
+            except WorksheetNotFound:
+                if not create:
+                    raise
+                sheet = self.conn.client._open_spreadsheet().add_worksheet(title=worksheet, rows=1000, cols=26)
+            handles[key] = sheet
+        
+        try:
+            yield sheet
+        except (APIError, WorksheetNotFound):
+            handles.pop(key, None)
+            raise
+    
+    def identity(self):
+        """The configured spreadsheet (URL or name from the connection secrets)."""
+        spreadsheet = getattr(self.conn.client, '_spreadsheet', None) or ''
+        return f'{self.name}:{spreadsheet}'
+    
+    @timed_storage('read')
+    def read(self, worksheet, ttl=None, **options):
+        return self.conn.read(worksheet=worksheet, ttl=ttl, **options)
+    
+    @timed_storage('read_since')
+    def read_since(self, worksheet, watermark):
+        """
+        Fetch only the sheet rows below the first `watermark` data rows.
+        
+        The header and the new rows come back in a single batch request.
+        """
+        with self._worksheet(worksheet) as sheet:
+            header, rows = sheet.batch_get(['1:1', f'A{watermark + 2}:ZZ'])
+        return self._frame(header, rows), watermark + len(rows)
+    
+    @timed_storage('read_first')
+    def read_first(self, worksheet, n_rows):
+        """Fetch the header and the first n_rows data rows in one batch request."""
+        with self._worksheet(worksheet) as sheet:
+            header, rows = sheet.batch_get(['1:1', f'A2:ZZ{n_rows + 1}'])
+        return self._frame(header, rows)
+    
+    @staticmethod
+    def _frame(header, rows):
+        """DataFrame from a batch_get header range and data range."""
+        header = header[0] if header else []
+        if not header:
+            return pd.DataFrame()
+        
+        # Pad short rows (trailing empty cells are omitted by the API)
+        width = len(header)
+        rows = [row[:width] + [''] * (width - len(row)) for row in rows]
+        df = pd.DataFrame(rows, columns=header)
+        return df.mask(df == '')
+    
+    @timed_storage('append')
+    def append(self, worksheet, entries):
+        """
+        Append rows to the end of a worksheet without rewriting it.
+        
+        Only the header row and the new rows go over the wire, so the cost of a
+        submission stays flat no matter how long the sheet grows. Any column in
+        the entries that is missing from the header (e.g. an older sheet without
+        Questions_Total) is added to the header first. A missing worksheet
+        (e.g. Answers on an older spreadsheet) is created.
+        
+        Values are written RAW: a player name like "=IMPORTXML(...)" or an ID
+        that looks like a number or date is stored exactly as submitted.
+        """
+        with self._worksheet(worksheet, create=True) as sheet:
+            # Match the sheet's existing column order
+            header = sheet.row_values(1)
+            missing = [col for col in entries[0] if col not in header]
+            if missing:
+                header = header + missing
+                sheet.update('A1', [header])
+            
+            rows = [[entry.get(col, '') for col in header] for entry in entries]
+            sheet.append_rows(
+                rows,
+                value_input_option='RAW',
+                insert_data_option='INSERT_ROWS',
+                table_range='A1'
+            )
     
-    /* Radio button labels/options */
-    .stRadio label, 
-    .stRadio [data-testid="stMarkdownContainer"] p,
-    .stRadio span,
-    [data-testid="stRadio"] label,
-    [data-testid="stRadio"] p,
-    [data-testid="stRadio"] span {
-        color: #000000 !important;
-        background-color: transparent !important;
-    }
+    @timed_storage('delete_first_rows')
+    def delete_first_rows(self, worksheet, n_rows):
+        """Delete the data rows right below the header; later appends are unaffected."""
+        with self._worksheet(worksheet) as sheet:
+            sheet.delete_rows(2, n_rows + 1)
     
-    /* Radio option containers */
-    .stRadio > div > label,
-    [data-testid="stRadio"] > div > label {
-        background-color: #f8f8f8 !important;
-        border: 1px solid #e0e0e0 !important;
-        border-radius: 6px;
-        padding: 0.75rem 1rem;
-        margin: 0.25rem 0;
-        cursor: pointer;
-        transition: all 0.2s ease;
-        color: #000000 !important;
-    }
+    @timed_storage('append_unique')
+    def append_unique(self, worksheet, entries):
+        """
+        Append only the rows whose Submission_ID isn't in the sheet yet.
+        
+        Only the header and the Submission_ID column are fetched, so a retried
+        batch that had in fact been written is merged instead of duplicated.
+        """
+        with self._worksheet(worksheet, create=True) as sheet:
+            header = sheet.row_values(1)
+            if 'Submission_ID' in header:
+                stored = set(sheet.col_values(header.index('Submission_ID') + 1)[1:])
+                entries = [entry for entry in entries if entry.get('Submission_ID') not in stored]
+        if entries:
+            self.append(worksheet, entries)
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Local SQLite storage with real indexes on Name and Date.
     
-    .stRadio > div > label:hover,
-    [data-testid="stRadio"] > div > label:hover {
-        background-color: #e8e8e8 !important;
-        border-color: #000000 !important;
-    }
+    Reads and writes stay on the local disk; Google Sheets is only touched by
+    sync_with_sheets(), which pulls the editor-maintained Questions sheet and
+    pushes newly added score rows to the Leaderboard and Global_History sheets.
+    A new database first imports the scores already in those sheets.
     
-    /* Selected radio option */
-    .stRadio > div > label[data-checked="true"],
-    [data-testid="stRadio"] > div > label[data-checked="true"] {
-        background-color: #e0e0e0 !important;
-        border-color: #000000 !important;
-    }
-    
-    /* Leaderboard table */
-    .leaderboard-container {
-        margin-top: 2rem;
-    }
+    The first sync runs in the background while local data is served; only a
+    read of a still-empty editorial table (a new database's Questions) waits
+    for it, so a new deployment doesn't start with an empty question bank.
+    """
     
-    /* Dataframe/Table styling */
-    .stDataFrame, [data-testid="stDataFrame"] {
-        background-color: #ffffff !important;
-    }
+    name = 'sqlite'
+    FIRST_SYNC_WAIT_SECONDS = 30  # Max wait for the first sync when an editorial table is empty
+    
+    def identity(self):
+        """The database file, as an absolute path."""
+        return f'{self.name}:{os.path.abspath(self.path)}'
+    
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self._create_tables()
+        self.synced = threading.Event()  # Set once the first Sheets sync has finished (or failed)
+    
+    def _create_tables(self):
+        """Create any missing tables and indexes."""
+        with self.lock, self.db:
+            for table, schema in TABLE_SCHEMAS.items():
+                columns = ', '.join(f'"{col}" {col_type}' for col, col_type in schema.items())
+                self.db.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+            for table, column in TABLE_INDEXES:
+                self.db.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{table}_{column}" ON "{table}" ("{column}")'
+                )
+            for table in SUBMISSION_TABLES:
+                # Databases created before Submission_ID existed need the column first
+                if 'Submission_ID' not in self._table_columns(table):
+                    self.db.execute(f'ALTER TABLE "{table}" ADD COLUMN "Submission_ID" TEXT')
+                self.db.execute(
+                    f'CREATE UNIQUE INDEX IF NOT EXISTS "idx_{table}_Submission_ID" '
+                    f'ON "{table}" ("Submission_ID")'
+                )
+            # Last rowid of each table already pushed to Sheets
+            self.db.execute(
+                'CREATE TABLE IF NOT EXISTS "_sync_state" ("table_name" TEXT PRIMARY KEY, "last_rowid" INTEGER)'
+            )
     
-    .stDataFrame th, .stDataFrame td,
-    [data-testid="stDataFrame"] th, 
-    [data-testid="stDataFrame"] td {
-        color: #000000 !important;
-        background-color: #ffffff !important;
-    }
+    def _table_columns(self, table):
+        """Return the column names of a table in storage order."""
+        return [row[1] for row in self.db.execute(f'PRAGMA table_info("{table}")')]
+    
+    @timed_storage('read')
+    def read(self, worksheet, ttl=None, **options):
+        if worksheet in EDITORIAL_TABLES and not self.synced.is_set():
+            with self.lock:
+                empty = self.db.execute(f'SELECT 1 FROM "{worksheet}" LIMIT 1').fetchone() is None
+            if empty:
+                self.synced.wait(timeout=self.FIRST_SYNC_WAIT_SECONDS)
+        with self.lock:
+            return pd.read_sql_query(f'SELECT * FROM "{worksheet}" ORDER BY rowid', self.db)
+    
+    @timed_storage('read_since')
+    def read_since(self, worksheet, rowid):
+        """Return (rows added after rowid, last rowid seen) using the rowid as watermark."""
+        with self.lock:
+            df = pd.read_sql_query(
+                f'SELECT rowid AS _rowid, * FROM "{worksheet}" WHERE rowid > ? ORDER BY rowid',
+                self.db,
+                params=(rowid,)
+            )
+        last_rowid = int(df['_rowid'].max()) if not df.empty else rowid
+        return df.drop(columns=['_rowid']), last_rowid
+    
+    @timed_storage('read_first')
+    def read_first(self, worksheet, n_rows):
+        with self.lock:
+            return pd.read_sql_query(
+                f'SELECT * FROM "{worksheet}" ORDER BY rowid LIMIT ?', self.db, params=(n_rows,)
+            )
     
-    /* ========== SCORE DISPLAY - FORCE WHITE TEXT ========== */
-    .score-display,
-    div.score-display {
-        background-color: #000000 !important;
-        color: #ffffff !important;
-        padding: 2rem;
-        border-radius: 8px;
-        text-align: center;
-        margin: 2rem 0;
-    }
+    @timed_storage('append')
+    def append(self, worksheet, entries):
+        with self.lock, self.db:
+            # Add any columns the table doesn't have yet
+            columns = self._table_columns(worksheet)
+            for col in entries[0]:
+                if col not in columns:
+                    self.db.execute(f'ALTER TABLE "{worksheet}" ADD COLUMN "{col}"')
+                    columns.append(col)
+            
+            # The UNIQUE index on Submission_ID turns repeated submissions into no-ops
+            names = list(entries[0])
+            placeholders = ', '.join('?' for _ in names)
+            quoted = ', '.join(f'"{col}"' for col in names)
+            self.db.executemany(
+                f'INSERT OR IGNORE INTO "{worksheet}" ({quoted}) VALUES ({placeholders})',
+                [[entry.get(col) for col in names] for entry in entries]
+            )
     
-    .score-display *,
-    .score-display div,
-    .score-display p,
-    .score-display span,
-    div.score-display *,
-    div.score-display div,
-    div.score-display p,
-    div.score-display span {
-        color: #ffffff !important;
-    }
+    def append_unique(self, worksheet, entries):
+        self.append(worksheet, entries)
+    
+    @timed_storage('delete_first_rows')
+    def delete_first_rows(self, worksheet, n_rows):
+        """
+        Delete the oldest n_rows rows, always keeping the newest one: SQLite
+        reuses rowids once a table is empty, which would confuse the rowid
+        watermarks used for syncing.
+        """
+        with self.lock, self.db:
+            self.db.execute(
+                f'DELETE FROM "{worksheet}" WHERE rowid IN '
+                f'(SELECT rowid FROM "{worksheet}" ORDER BY rowid LIMIT ?) '
+                f'AND rowid < (SELECT MAX(rowid) FROM "{worksheet}")',
+                (n_rows,)
+            )
     
-    .score-number,
-    .score-display .score-number {
-        font-size: 4rem;
-        font-weight: 700;
-        line-height: 1;
-        color: #ffffff !important;
-    }
+    def replace(self, worksheet, df):
+        """Replace the contents of a table with a DataFrame."""
+        with self.lock, self.db:
+            self.db.execute(f'DELETE FROM "{worksheet}"')
+            columns = self._table_columns(worksheet)
+            df = df[[col for col in df.columns if col in columns]]
+            quoted = ', '.join(f'"{col}"' for col in df.columns)
+            placeholders = ', '.join('?' for _ in df.columns)
+            self.db.executemany(
+                f'INSERT INTO "{worksheet}" ({quoted}) VALUES ({placeholders})',
+                df.astype(object).where(df.notna(), None).values.tolist()
+            )
     
-    .score-label,
-    .score-display .score-label {
-        font-size: 1rem;
-        color: #cccccc !important;
-        margin-top: 0.5rem;
-    }
+    def import_from_sheets(self, sheets, table):
+        """
+        One-time import of a score table's existing Sheets rows.
+        
+        Runs only while the table is empty and has never been synced, i.e. on
+        the first sync of a new database, so a deployment switching to SQLite
+        starts from the real history instead of pushing a diverging copy.
+        Rows are deduplicated by Submission_ID, and the sync watermark is set
+        past them in the same transaction so they are never pushed back.
+        """
+        with self.lock:
+            synced = self.db.execute(
+                'SELECT 1 FROM "_sync_state" WHERE table_name = ?', (table,)
+            ).fetchone()
+            empty = self.db.execute(f'SELECT 1 FROM "{table}" LIMIT 1').fetchone() is None
+        if synced or not empty:
+            return
+        
+        try:
+            rows = sheets.read(table, ttl=0)
+        except WorksheetNotFound:
+            rows = None  # Nothing to import (e.g. no Answers worksheet yet)
+        rows = drop_duplicate_submissions(rows.dropna(how='all')) if rows is not None else None
+        
+        with self.lock, self.db:
+            # A score saved locally since the check above wins; sync as usual
+            if self.db.execute(f'SELECT 1 FROM "{table}" LIMIT 1').fetchone() is not None:
+                return
+            last_rowid = 0
+            if rows is not None and not rows.empty:
+                columns = self._table_columns(table)
+                for col in rows.columns:
+                    if col not in columns:
+                        self.db.execute(f'ALTER TABLE "{table}" ADD COLUMN "{col}"')
+                quoted = ', '.join(f'"{col}"' for col in rows.columns)
+                placeholders = ', '.join('?' for _ in rows.columns)
+                self.db.executemany(
+                    f'INSERT OR IGNORE INTO "{table}" ({quoted}) VALUES ({placeholders})',
+                    rows.astype(object).where(rows.notna(), None).values.tolist()
+                )
+                last_rowid = self.db.execute(f'SELECT COALESCE(MAX(rowid), 0) FROM "{table}"').fetchone()[0]
+            self.db.execute('INSERT OR REPLACE INTO "_sync_state" VALUES (?, ?)', (table, last_rowid))
+    
+    def sync_with_sheets(self, sheets):
+        """
+        Two-way editorial sync with Google Sheets.
+        
+        Questions flow Sheets -> SQLite (editors keep writing questions in the
+        sheet). Score rows flow SQLite -> Sheets, appending only rows added since
+        the last sync, after a new database has imported the existing ones.
+        """
+        questions = sheets.read("Questions", ttl=0, usecols=list(range(6)))
+        if questions is not None and not questions.empty:
+            self.replace("Questions", questions.dropna(how='all'))
+        
+        # Curated quiz sets are optional; without the worksheet the seeded sets are used
+        try:
+            quiz_sets = sheets.read("Quiz_Sets", ttl=0)
+        except Exception:
+            quiz_sets = None
+        if quiz_sets is not None and not quiz_sets.empty and 'Question_IDs' in quiz_sets.columns:
+            self.replace("Quiz_Sets", quiz_sets.dropna(how='all'))
+        
+        for table in SUBMISSION_TABLES:
+            self.import_from_sheets(sheets, table)
+            with self.lock:
+                row = self.db.execute(
+                    'SELECT last_rowid FROM "_sync_state" WHERE table_name = ?', (table,)
+                ).fetchone()
+            new_rows, last_rowid = self.read_since(table, row[0] if row else 0)
+            if new_rows.empty:
+                continue
+            
+            # A crash between the append and the watermark update would resend rows
+            entries = new_rows.astype(object).where(new_rows.notna(), '').to_dict('records')
+            sheets.append_unique(table, entries)
+            with self.lock, self.db:
+                self.db.execute(
+                    'INSERT OR REPLACE INTO "_sync_state" VALUES (?, ?)', (table, last_rowid)
+                )
 
-    /* Error messages */
-    .error-box {
-        background-color: #f8f8f8 !important;
-        border: 1px solid #cccccc;
-        border-radius: 8px;
-        padding: 1.5rem;
-        text-align: center;
-        color: #333333 !important;
-    }
+
+# ============================================================================
+# STORAGE CONNECTION
+# ============================================================================
+@st.cache_resource(ttl=60)
+def get_sheets_connection():
+    """Create and cache the Google Sheets connection."""
+    try:
+        conn = st.connection("gsheets", type=GSheetsConnection)
+        return conn, None
+    except Exception as e:
+        return None, str(e)
+
+
+@st.cache_resource
+def get_worksheet_handles():
+    """Process-wide gspread Worksheets by (client, worksheet name), for SheetsStorage."""
+    return {}
+
+
+@st.cache_resource
+def get_sqlite_storage():
+    """
+    Open the process-wide SQLite backend and start its Sheets sync thread.
     
-    /* Warning/Info boxes */
-    .stAlert, [data-testid="stAlert"] {
-        background-color: #f8f8f8 !important;
-        color: #000000 !important;
-    }
+    The first sync (question bank pull, score import) runs on that thread
+    right away, so the first page render doesn't wait for Sheets.
+    """
+    storage = SQLiteStorage(os.path.join(APP_DIR, SQLITE_PATH))
+    conn, error = get_sheets_connection()
     
-    .stAlert p, [data-testid="stAlert"] p {
-        color: #000000 !important;
-    }
+    if conn and not error:
+        sheets = SheetsStorage(conn)
+        
+        def sync_loop():
+            while True:
+                try:
+                    storage.sync_with_sheets(sheets)
+                except Exception:
+                    pass  # Sheets is only an editorial mirror; retry next cycle
+                storage.synced.set()
+                time.sleep(SHEETS_SYNC_SECONDS)
+        
+        threading.Thread(target=sync_loop, daemon=True).start()
+    else:
+        storage.synced.set()  # Nothing to wait for
     
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
+    return storage
+
+
+def get_connection():
+    """Return the configured storage backend (STORAGE_BACKEND) and any error."""
+    if STORAGE_BACKEND == "sqlite":
+        try:
+            return get_sqlite_storage(), None
+        except Exception as e:
+            return None, str(e)
+    
+    conn, error = get_sheets_connection()
+    if error:
+        return None, error
+    return SheetsStorage(conn), None
+
+
+# ============================================================================
+# QUESTION BANK
+# ============================================================================
+QUESTION_COLUMNS = list(TABLE_SCHEMAS['Questions'])
+
+
+def get_question_id(question):
+    """Stable id for a question, derived from its text."""
+    return hashlib.sha1(str(question).strip().encode('utf-8')).hexdigest()[:12]
+
+
+def get_records_digest(records):
+    """
+    Content digest of question records, stable across processes and restarts.
     
-    /* Divider */
-    hr {
-        border: none;
-        border-top: 1px solid #e0e0e0;
-        margin: 2rem 0;
-    }
+    Blank cells (NaN) are digested as '' so that a reload of an unchanged
+    sheet always produces the same digest.
+    """
+    normalized = [['' if pd.isna(value) else str(value) for value in record] for record in records]
+    return hashlib.sha1(json.dumps(normalized).encode('utf-8')).hexdigest()
+
+
+class QuestionBank:
+    """
+    Validated, immutable snapshot of the Questions sheet.
     
-    /* ========== STAT CARDS ========== */
-    .stat-card {
-        background-color: #f8f8f8 !important;
-        border: 1px solid #e0e0e0;
-        border-radius: 8px;
-        padding: 1.5rem;
-        text-align: center;
-        margin: 0.5rem 0;
-    }
+    Questions are stored as tuples keyed by a stable Question_ID, so drawing
+    a quiz is an O(k) index sample instead of a DataFrame shuffle.
+    """
     
-    .stat-card * {
-        color: #000000 !important;
-    }
+    def __init__(self, df):
+        df = df.dropna(how='all')
+        
+        # Validate required columns
+        if not all(col in df.columns for col in QUESTION_COLUMNS):
+            raise ValueError(f"Missing columns. Required: {QUESTION_COLUMNS}")
+        
+        records = {}
+        for row in df[QUESTION_COLUMNS].itertuples(index=False):
+            records.setdefault(get_question_id(row.Question), tuple(row))
+        
+        self.records = tuple((question_id,) + record for question_id, record in records.items())
+        self.signature = get_records_digest(self.records)
     
-    .stat-value {
-        font-size: 2rem;
-        font-weight: 700;
-        color: #000000 !important;
-        line-height: 1.2;
-    }
+    def __len__(self):
+        return len(self.records)
     
-    .stat-label {
-        font-size: 0.875rem;
-        color: #666666 !important;
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-        margin-top: 0.5rem;
-    }
+    def sample(self, n_questions, rng=random):
+        """Return n_questions random questions as a DataFrame."""
+        picks = rng.sample(range(len(self.records)), n_questions)
+        return self.frame([self.records[i] for i in picks])
     
-    .stat-sublabel {
-        font-size: 0.75rem;
-        color: #999999 !important;
-        margin-top: 0.25rem;
-    }
+    def frame(self, records):
+        """Build a quiz DataFrame from question records."""
+        return pd.DataFrame.from_records(records, columns=['Question_ID'] + QUESTION_COLUMNS)
     
-    /* Tabs styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 2rem;
-    }
+    def select(self, question_ids, n_questions, seed):
+        """
+        Return the questions with the given IDs, in order, as a DataFrame.
+        
+        IDs no longer in the bank (e.g. an edited question) are skipped, and
+        the set is topped up to n_questions with a draw seeded by `seed`, so
+        every process fills the gap the same way.
+        """
+        by_id = {record[0]: record for record in self.records}
+        picks = list(dict.fromkeys(i for i in question_ids if i in by_id))[:n_questions]
+        if len(picks) < n_questions:
+            chosen = set(picks)
+            rest = [record[0] for record in self.records if record[0] not in chosen]
+            picks += random.Random(seed).sample(rest, n_questions - len(picks))
+        return self.frame([by_id[i] for i in picks])
+
+
+class QuestionBankLoader:
+    """
+    Process-wide holder of the current QuestionBank.
+    
+    The welcome screen starts the first load in the background (prefetch),
+    so the bank is usually ready before anyone clicks Start Quiz; afterwards
+    the sheet is re-read in a background thread every
+    QUESTION_BANK_REFRESH_SECONDS and the bank is only replaced when its
+    contents changed, so starting a quiz never waits on the network.
+    A quiz started while the first load is still running waits for it
+    rather than reading the sheet a second time.
+    """
     
-    .stTabs [data-baseweb="tab"] {
-        color: #000000 !important;
-        font-weight: 500;
-    }
+    LOAD_WAIT_SECONDS = 30  # Max wait for an in-flight first load before reading the sheet again
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bank = None
+        self.last_check = 0.0
+        self.refreshing = False
+        self.idle = threading.Event()  # Set whenever no background load is running
+        self.idle.set()
+    
+    def load(self, storage):
+        """Read and validate the Questions sheet, keeping the bank if unchanged."""
+        df = storage.read("Questions", usecols=list(range(6)), ttl=0)
+        bank = QuestionBank(df)
+        with self.lock:
+            if self.bank is None or bank.signature != self.bank.signature:
+                self.bank = bank
+            self.last_check = time.time()
+    
+    def _refresh(self, storage):
+        """Background load; on failure keep serving the last good bank."""
+        try:
+            self.load(storage)
+        except Exception:
+            self.last_check = time.time()
+        finally:
+            with self.lock:
+                self.refreshing = False
+                self.idle.set()
+    
+    def _start_refresh(self, storage, when):
+        """Start a background load if when(self) holds and none is running."""
+        with self.lock:
+            start = when(self) and not self.refreshing
+            if start:
+                self.refreshing = True
+                self.idle.clear()
+        if start:
+            threading.Thread(target=self._refresh, args=(storage,), daemon=True).start()
+    
+    def prefetch(self, storage):
+        """Start loading the bank in the background if it isn't loaded yet."""
+        self._start_refresh(storage, lambda loader: loader.bank is None)
+    
+    def get(self, storage):
+        """Return the current bank, loading it on first use."""
+        get_metrics().cache_result('question_bank', hit=self.bank is not None)
+        if self.bank is None:
+            # A prefetch is usually already on its way; only read the sheet if none is
+            self.idle.wait(timeout=self.LOAD_WAIT_SECONDS)
+            if self.bank is None:
+                self.load(storage)
+            return self.bank
+        
+        self._start_refresh(
+            storage,
+            lambda loader: time.time() - loader.last_check >= QUESTION_BANK_REFRESH_SECONDS
+        )
+        return self.bank
+
+
+@st.cache_resource
+def get_question_bank_loader():
+    """Create the process-wide question bank loader."""
+    return QuestionBankLoader()
+
+
+def build_quiz_payload(questions):
+    """
+    Pre-render what the quiz screen shows for each question.
     
-    .stTabs [aria-selected="true"] {
-        color: #000000 !important;
-        border-bottom-color: #000000 !important;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Apply background image with f-string
-st.markdown(f"""
-<style>
-    /* ========== BACKGROUND IMAGE ========== */
-    .stApp, [data-testid="stAppViewContainer"] {{
-        background-image: url('{BACKGROUND_IMAGE_URL}');
-        background-size: cover;
-        background-position: center;
-        background-repeat: no-repeat;
-        background-attachment: fixed;
-    }}
-    
-    [data-testid="stHeader"] {{
-        background-color: transparent !important;
-    }}
-    
-    /* ========== CLEAN CENTERED CARD ========== */
-    .block-container {{
-        background-color: rgba(255, 255, 255, 0.6) !important;
-        border-radius: 20px;
-        padding: 2rem !important;
-        margin: 2rem auto;
-        max-width: 700px;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.25);
-    }}
-    
-    /* ========== REMOVE ALL NESTED BACKGROUNDS ========== */
-    .block-container .element-container,
-    .block-container .stMarkdown,
-    .block-container [data-testid="stMarkdownContainer"],
-    .block-container .stTextInput,
-    .block-container .stButton,
-    .block-container .stAlert,
-    .block-container [data-testid="stAlert"],
-    .block-container .stExpander,
-    .block-container [data-testid="stExpander"] {{
-        background-color: transparent !important;
-        box-shadow: none !important;
-    }}
-    
-    /* ========== CENTER THE HEADER ========== */
-    .main-title {{
-        text-align: center !important;
-        display: block !important;
-        width: 100% !important;
-        background: transparent !important;
-    }}
-    
-    .subtitle {{
-        text-align: center !important;
-        display: block !important;
-        width: 100% !important;
-        background: transparent !important;
-    }}
-    
-    /* ========== FIX TEXT COLORS ========== */
-    /* All text should be dark/black */
-    .block-container p,
-    .block-container label,
-    .block-container span,
-    .block-container div,
-    .stTextInput label,
-    .stTextInput label p,
-    .stTextInput label span,
-    .stTextInput [data-testid="stWidgetLabel"],
-    .stTextInput [data-testid="stWidgetLabel"] p,
-    [data-testid="stWidgetLabel"],
-    [data-testid="stWidgetLabel"] p,
-    [data-testid="stWidgetLabel"] span {{
-        color: #000000 !important;
-    }}
-    
-    /* Exclude button text - keep white */
-    .stButton button,
-    .stButton button *,
-    .stButton button p,
-    .stButton button span {{
-        color: #ffffff !important;
-    }}
-    
-    /* Exclude score-display - keep white */
-    .score-display,
-    .score-display * {{
-        color: #ffffff !important;
-    }}
-    
-    .score-label {{
-        color: #cccccc !important;
-    }}
-    
-    /* Exclude timer-container - keep white */
-    .block-container .timer-container,
-    .block-container .timer-container *,
-    .block-container .timer-container p,
-    .block-container .timer-container span,
-    .block-container .timer-container div,
-    .block-container .timer-warning,
-    .block-container .timer-warning *,
-    .block-container div.timer-container,
-    .block-container div.timer-container *,
-    .timer-container,
-    .timer-container *,
-    .timer-warning,
-    .timer-warning * {{
-        color: #ffffff !important;
-    }}
-    .timer-container,
-    .timer-container *,
-    .timer-warning,
-    .timer-warning * {{
-        color: #ffffff !important;
-    }}
-    
-    /* ========== ALERT/WARNING BOX - transparent ========== */
-    .stAlert, [data-testid="stAlert"] {{
-        background-color: rgba(255, 200, 100, 0.3) !important;
-        border: 1px solid rgba(200, 150, 50, 0.5) !important;
-    }}
-</style>
-""", unsafe_allow_html=True)
+    Returns one (number_html, question_html, options) tuple per question, so
+    reruns of the quiz screen only hand ready-made strings to Streamlit.
+    """
+    total = len(questions)
+    payload = []
+    for idx, row in enumerate(questions.itertuples(index=False)):
+        payload.append((
+            f'<div class="question-number">Question {idx + 1} of {total}</div>',
+            f'<div class="question-text">{row.Question}</div>',
+            (
+                f"A) {row.Option_A}",
+                f"B) {row.Option_B}",
+                f"C) {row.Option_C}",
+                f"D) {row.Option_D}"
+            )
+        ))
+    return tuple(payload)
 
 
 # ============================================================================
-# SESSION STATE INITIALIZATION
+# QUIZ SETS
 # ============================================================================
-def init_session_state():
-    """Initialize all session state variables."""
-    defaults = {
-        'player_name': '',
-        'game_started': False,
-        'start_time': None,
-        'questions': None,
-        'answers': {},
-        'submitted': False,
-        'score': 0,
-        'time_taken': 0,
-        'connection_error': None,
-        'questions_total': NUM_QUESTIONS
-    }
-    for key, value in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
+def get_quiz_seed(window_key):
+    """Seed for a window's question draw, the same in every process."""
+    return int.from_bytes(hashlib.sha256(window_key.encode('utf-8')).digest()[:8], 'big')
 
 
-# ============================================================================
-# GOOGLE SHEETS CONNECTION
-# ============================================================================
-@st.cache_resource(ttl=60)
-def get_connection():
-    """Create and cache the Google Sheets connection."""
-    try:
-        conn = st.connection("gsheets", type=GSheetsConnection)
-        return conn, None
-    except Exception as e:
-        return None, str(e)
+class QuizSet:
+    """The questions served to every player in one play window."""
+    
+    def __init__(self, window_key, questions, bank_signature):
+        self.window_key = window_key
+        self.questions = questions
+        self.payload = build_quiz_payload(questions)
+        self.bank_signature = bank_signature
+
+
+class QuizSetCache:
+    """
+    Process-wide cache of the quiz set for each play window.
+    
+    The first request in a window reads the window's row from the Quiz_Sets
+    worksheet (so an editor can curate a set ahead of time); without one, the
+    set is drawn from the bank with a seed derived from the window key and
+    stored there. Either way it is resolved and pre-rendered once, and every
+    later session in the window gets the same objects. A bank edit
+    re-resolves the stored IDs but never redraws the set mid-window.
+    """
+    
+    MAX_WINDOWS = 2  # The current window, plus the last one for quizzes started just before rollover
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sets = OrderedDict()
+    
+    def load_ids(self, storage, window_key):
+        """Return the stored Question_IDs for a window, or None."""
+        try:
+            df = storage.read("Quiz_Sets", ttl=0)
+        except Exception:
+            # No Quiz_Sets worksheet: fall back to the seeded draw
+            return None
+        if df is None or df.empty or 'Window' not in df.columns or 'Question_IDs' not in df.columns:
+            return None
+        
+        rows = df[df['Window'].astype(str).str.strip() == window_key]['Question_IDs'].dropna()
+        if rows.empty:
+            return None
+        return [i.strip() for i in str(rows.iloc[0]).split(',') if i.strip()]
+    
+    def store_ids(self, storage, window_key, question_ids):
+        """Record a window's drawn set; best effort, the draw is reproducible anyway."""
+        try:
+            storage.append("Quiz_Sets", [{
+                'Window': window_key,
+                'Question_IDs': ','.join(question_ids),
+                'Created': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }])
+        except Exception:
+            pass
+    
+    def get(self, storage, bank, window_key, n_questions):
+        """Return the QuizSet for a window, resolving it on first use."""
+        with self.lock:
+            quiz = self.sets.get(window_key)
+            hit = (
+                quiz is not None
+                and quiz.bank_signature == bank.signature
+                and len(quiz.questions) == n_questions
+            )
+            get_metrics().cache_result('quiz_set', hit=hit)
+            if hit:
+                return quiz
+            
+            seed = get_quiz_seed(window_key)
+            if quiz is not None:
+                # Bank edited mid-window: keep the same questions where they still exist
+                question_ids = quiz.questions['Question_ID'].tolist()
+            else:
+                question_ids = self.load_ids(storage, window_key)
+            
+            if question_ids is None:
+                questions = bank.sample(n_questions, rng=random.Random(seed))
+                self.store_ids(storage, window_key, questions['Question_ID'].tolist())
+            else:
+                questions = bank.select(question_ids, n_questions, seed)
+            
+            quiz = QuizSet(window_key, questions, bank.signature)
+            self.sets[window_key] = quiz
+            self.sets.move_to_end(window_key)
+            while len(self.sets) > self.MAX_WINDOWS:
+                self.sets.popitem(last=False)
+            return quiz
 
 
+@st.cache_resource
+def get_quiz_set_cache():
+    """Create the process-wide quiz set cache."""
+    return QuizSetCache()
+
+
+@timed
 def fetch_questions(conn):
-    """Fetch trivia questions from the Questions sheet."""
+    """Get this play window's trivia questions from the shared question bank."""
     try:
-        df = conn.read(
-            worksheet="Questions",
-            usecols=list(range(6)),  # Columns A-F
-            ttl=60  # Cache for 60 seconds
-        )
-        # Clean the dataframe
-        df = df.dropna(how='all')
-        
-        # Validate required columns
-        required_cols = ['Question', 'Option_A', 'Option_B', 'Option_C', 'Option_D', 'Correct_Answer']
-        if not all(col in df.columns for col in required_cols):
-            return None, f"Missing columns. Required: {required_cols}"
+        bank = get_question_bank_loader().get(conn)
         
-        # Get random questions (based on NUM_QUESTIONS config)
-        n_questions = min(NUM_QUESTIONS, len(df))
+        # Get questions (based on NUM_QUESTIONS config)
+        n_questions = min(NUM_QUESTIONS, len(bank))
         if n_questions == 0:
             return None, "No questions found in the sheet."
         
-        questions = df.sample(n=n_questions).reset_index(drop=True)
+        if QUIZ_MODE == "window":
+            quiz = get_quiz_set_cache().get(conn, bank, get_window_key(datetime.now()), n_questions)
+            # The shared frame is never modified; the copy keeps it that way
+            questions = quiz.questions.copy()
+            st.session_state.quiz_payload = quiz.payload
+        else:
+            questions = bank.sample(n_questions)
+            st.session_state.quiz_payload = build_quiz_payload(questions)
+        
         st.session_state.questions_total = n_questions
         return questions, None
+    except ValueError as e:
+        return None, str(e)
     except Exception as e:
         return None, f"Error fetching questions: {str(e)}"
 
 
-def append_to_leaderboard(conn, name, score, time_taken):
-    """Append a new entry to the Leaderboard sheet (weekly view)."""
-    try:
-        # Read existing leaderboard
-        existing = conn.read(worksheet="Leaderboard", ttl=1)
-        
-        # Create new entry
-        new_entry = pd.DataFrame([{
-            'Name': name,
-            'Score': score,
-            'Time_Taken': time_taken,
-            'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }])
-        
-        # Combine with existing data
-        if existing is not None and not existing.empty:
-            existing = existing.dropna(how='all')
-            updated = pd.concat([existing, new_entry], ignore_index=True)
-        else:
-            updated = new_entry
-        
-        # Write back to sheet
-        conn.update(worksheet="Leaderboard", data=updated)
-        return True, None
-    except Exception as e:
-        return False, f"Error saving score: {str(e)}"
+# ============================================================================
+# SCORES & HISTORY
+# ============================================================================
+def new_submission_id():
+    """Return a fresh ID identifying one played game."""
+    return uuid.uuid4().hex
 
 
-def append_to_global_history(conn, name, score, time_taken, questions_total):
-    """Append a new entry to the Global_History sheet (permanent archive)."""
-    try:
-        # Read existing history
-        existing = conn.read(worksheet="Global_History", ttl=1)
-        
-        # Create new entry with all fields
-        new_entry = pd.DataFrame([{
-            'Name': name,
-            'Score': score,
-            'Time_Taken': time_taken,
-            'Questions_Total': questions_total,
-            'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'Date': datetime.now().strftime('%Y-%m-%d')
-        }])
-        
-        # Combine with existing data
-        if existing is not None and not existing.empty:
-            existing = existing.dropna(how='all')
-            updated = pd.concat([existing, new_entry], ignore_index=True)
-        else:
-            updated = new_entry
-        
-        # Write back to sheet
-        conn.update(worksheet="Global_History", data=updated)
-        return True, None
-    except Exception as e:
-        return False, f"Error saving to history: {str(e)}"
+def make_leaderboard_entry(name, score, time_taken, submission_id=None):
+    """Build a Leaderboard row, tagged with the current play window."""
+    return {
+        'Name': name,
+        'Score': score,
+        'Time_Taken': time_taken,
+        'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'Submission_ID': submission_id or new_submission_id(),
+        'Window': get_window_key(datetime.now())
+    }
 
 
-def get_leaderboard(conn):
-    """Fetch the current leaderboard."""
-    try:
-        df = conn.read(worksheet="Leaderboard", ttl=1)
-        if df is None or df.empty:
-            return pd.DataFrame(columns=['Name', 'Score', 'Time_Taken', 'Timestamp'])
-        
-        df = df.dropna(how='all')
-        # Sort by score (desc) then time (asc)
-        if 'Score' in df.columns and 'Time_Taken' in df.columns:
-            df = df.sort_values(
-                by=['Score', 'Time_Taken'],
-                ascending=[False, True]
-            ).reset_index(drop=True)
+def make_history_entry(name, score, time_taken, questions_total, submission_id=None):
+    """Build a Global_History row with all fields."""
+    return {
+        'Name': name,
+        'Score': score,
+        'Time_Taken': time_taken,
+        'Questions_Total': questions_total,
+        'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'Date': datetime.now().strftime('%Y-%m-%d'),
+        'Submission_ID': submission_id or new_submission_id()
+    }
+
+
+def grade_answers(questions, answers):
+    """
+    Grade a quiz in one vectorized comparison.
+    
+    Returns (given, hits): the chosen letter per question ('' if unanswered)
+    and a boolean array of which ones match Correct_Answer.
+    """
+    correct = questions['Correct_Answer'].astype(str).str.strip().str.upper().to_numpy()
+    given = np.array(
+        [answers.get(idx, '').strip().upper() for idx in questions.index],
+        dtype=object
+    )
+    return given, given == correct
+
+
+def make_answers_entry(name, questions, given, hits, submission_id=None):
+    """
+    Build an Answers row: one game's answers, packed into one row.
+    
+    Question_IDs is comma-joined, Answers holds one letter per question
+    ('-' if unanswered) and Correct one '1'/'0' flag per question, so a game
+    costs a single row however many questions it had.
+    """
+    return {
+        'Submission_ID': submission_id or new_submission_id(),
+        'Name': name,
+        'Window': get_window_key(datetime.now()),
+        'Question_IDs': ','.join(questions['Question_ID'].astype(str)),
+        'Answers': ''.join(letter[:1] or '-' for letter in given),
+        'Correct': ''.join('1' if hit else '0' for hit in hits),
+        'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def drop_duplicate_submissions(df, seen=None):
+    """
+    Keep the first row of each Submission_ID.
+    
+    Rows without an ID (written before IDs existed) are always kept. If a
+    `seen` set is given, rows whose ID is already in it are dropped too and
+    the kept IDs are added to it.
+    """
+    if df is None or df.empty or 'Submission_ID' not in df.columns:
         return df
-    except Exception as e:
-        return pd.DataFrame(columns=['Name', 'Score', 'Time_Taken', 'Timestamp'])
+    
+    ids = df['Submission_ID']
+    has_id = ids.notna() & (ids != '')
+    duplicate = has_id & ids.duplicated()
+    if seen:
+        # Probe the set directly; isin() would rebuild a hash table of all of it
+        duplicate |= has_id & pd.Series([i in seen for i in ids.tolist()], index=ids.index)
+    if seen is not None:
+        seen.update(ids[has_id & ~duplicate].tolist())
+    return df[~duplicate] if duplicate.any() else df
 
 
-def get_global_history(conn):
-    """Fetch the global history for stats calculations."""
+class IncrementalLoader:
+    """
+    Base for the process-wide copies of an append-only worksheet
+    (LeaderboardRanking, HistoryLoader, QuestionStats).
+    
+    refresh() fetches only the rows added past a row watermark, at most every
+    HISTORY_REFRESH_SECONDS, and drops rows whose Submission_ID is already
+    loaded. Every FULL_RELOAD_SECONDS, or whenever needs_full_reload() says
+    so, it re-reads the whole worksheet instead, in case rows were edited in
+    place. Subclasses fold the rows in with load(), replacing their state on
+    a full reload. Nothing is replaced until the read has succeeded, so a
+    failed refresh keeps serving what is already loaded.
+    """
+    
+    WORKSHEET = None  # Worksheet the rows come from
+    CACHE = None  # Cache label in the metrics
+    FULL_RELOAD_SECONDS = HISTORY_FULL_RELOAD_SECONDS
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.submission_ids = set()  # IDs already loaded, to skip repeated rows
+        self.watermark = 0
+        self.last_refresh = 0.0
+        self.last_full_reload = 0.0
+    
+    def refresh(self, storage):
+        """Fetch any new rows (at most every HISTORY_REFRESH_SECONDS)."""
+        with self.lock:
+            now = time.time()
+            fresh = now - self.last_refresh < HISTORY_REFRESH_SECONDS
+            get_metrics().cache_result(self.CACHE, hit=fresh)
+            if fresh:
+                return
+            
+            self.before_refresh(storage, now)
+            full_reload = now - self.last_full_reload >= self.FULL_RELOAD_SECONDS or self.needs_full_reload()
+            new_rows, watermark = self.read(storage, 0 if full_reload else self.watermark, full_reload)
+            
+            submission_ids = set() if full_reload else self.submission_ids
+            new_rows = drop_duplicate_submissions(new_rows.dropna(how='all'), submission_ids)
+            self.load(new_rows, full_reload)
+            
+            self.submission_ids = submission_ids
+            if full_reload:
+                self.last_full_reload = now
+            self.watermark = watermark
+            self.last_refresh = now
+            self.after_refresh(storage, new_rows, full_reload, now)
+    
+    def needs_full_reload(self):
+        """Whether to start over before the FULL_RELOAD_SECONDS schedule."""
+        return False
+    
+    def read(self, storage, watermark, full_reload):
+        """Return (rows past watermark, new watermark)."""
+        return storage.read_since(self.WORKSHEET, watermark)
+    
+    def load(self, rows, full_reload):
+        """Fold deduplicated new rows in (replacing everything on a full reload)."""
+        raise NotImplementedError
+    
+    def before_refresh(self, storage, now):
+        """Called under the lock before each read."""
+    
+    def after_refresh(self, storage, rows, full_reload, now):
+        """Called under the lock once the new rows are loaded."""
+
+
+def refresh_or_serve_stale(loader, conn):
+    """Refresh a process-wide loader; if that fails, count it and serve what is already loaded."""
     try:
-        df = conn.read(worksheet="Global_History", ttl=5)
-        if df is None or df.empty:
-            return pd.DataFrame(columns=['Name', 'Score', 'Time_Taken', 'Questions_Total', 'Timestamp', 'Date'])
+        loader.refresh(conn)
+    except Exception:
+        get_metrics().inc('refresh_errors_total', cache=loader.CACHE)
+
+
+class LeaderboardRanking(IncrementalLoader):
+    """
+    The current play window's Leaderboard, kept in rank order:
+    (Score desc, Time_Taken asc).
+    
+    Rows are loaded incrementally like Global_History and inserted with
+    bisect, so a new score costs O(log n) comparisons, the top K is a slice
+    and "what rank is this score" is a single binary search, instead of
+    sorting the whole sheet on every view.
+    
+    Only rows of the current window are kept. On each full reload, rows of
+    past windows at the top of the sheet are deleted (ROTATE_LEADERBOARD),
+    so the sheet, and every read of it, stays the size of one window.
+    """
+    
+    WORKSHEET = "Leaderboard"
+    CACHE = 'leaderboard'
+    FULL_RELOAD_SECONDS = LEADERBOARD_FULL_RELOAD_SECONDS  # Also the rotation schedule
+    
+    def __init__(self):
+        super().__init__()
+        self.keys = []  # Sorted (-Score, Time_Taken, seq)
+        self.rows = {}  # seq -> (Name, Score, Time_Taken)
+        self.seq = 0
+        self.window = None  # Window index the loaded rows belong to
+    
+    @staticmethod
+    def rank_key(score, time_taken):
+        """Sort key for a score: lower sorts first (better)."""
+        time_taken = float(time_taken)
+        return (-float(score), time_taken if time_taken == time_taken else float('inf'))
+    
+    @staticmethod
+    def clean(df):
+        """Return (Name, Score, Time_Taken, Submission_ID) tuples of the scoreable rows."""
+        if df is None or df.empty or 'Score' not in df.columns:
+            return []
+        def as_number(value):
+            # Sheets hands back strings and floats; show 7, not 7.0
+            return int(value) if value == value and value.is_integer() else value
         
-        df = df.dropna(how='all')
+        scores = pd.to_numeric(df['Score'], errors='coerce')
+        keep = scores.notna().to_numpy()
+        df = df[keep]
+        n_rows = len(df)
         
-        # Ensure Questions_Total exists and handle missing values (assume 5 for old data)
-        if 'Questions_Total' not in df.columns:
-            df['Questions_Total'] = 5
+        names = df['Name'].tolist() if 'Name' in df.columns else [''] * n_rows
+        times = (
+            pd.to_numeric(df['Time_Taken'], errors='coerce').astype(float).tolist()
+            if 'Time_Taken' in df.columns else [float('nan')] * n_rows
+        )
+        ids = df['Submission_ID'].tolist() if 'Submission_ID' in df.columns else [None] * n_rows
+        
+        return [
+            (name, as_number(score), as_number(time_taken),
+             submission_id if isinstance(submission_id, str) and submission_id else None)
+            for name, score, time_taken, submission_id
+            in zip(names, scores[keep].astype(float).tolist(), times, ids)
+        ]
+    
+    def _add(self, rows, keys):
+        """Add cleaned rows to keys (kept sorted) and self.rows."""
+        new_keys = []
+        for name, score, time_taken, _ in rows:
+            self.seq += 1
+            self.rows[self.seq] = (name, score, time_taken)
+            new_keys.append(self.rank_key(score, time_taken) + (self.seq,))
+        
+        # Insert a few new scores in place; re-sort once for a bulk load
+        if len(new_keys) <= 32:
+            for key in new_keys:
+                bisect.insort(keys, key)
         else:
-            df['Questions_Total'] = df['Questions_Total'].fillna(5)
+            keys.extend(new_keys)
+            keys.sort()
+    
+    def needs_full_reload(self):
+        """Start over whenever a new window opens."""
+        return get_window_index(datetime.now()) != self.window
+    
+    def read(self, storage, watermark, full_reload):
+        """Read new rows; a full reload first rotates out past windows."""
+        new_rows, watermark = storage.read_since(self.WORKSHEET, watermark)
+        if full_reload and ROTATE_LEADERBOARD and not new_rows.empty:
+            new_rows, watermark = self.rotate(storage, new_rows, watermark)
+        return new_rows, watermark
+    
+    def load(self, rows, full_reload):
+        """Insert the current window's rows in rank order."""
+        if not rows.empty:
+            rows = rows[in_current_window(rows)]
+        rows = self.clean(rows)
         
-        # Ensure Date column exists
-        if 'Date' not in df.columns and 'Timestamp' in df.columns:
-            df['Date'] = pd.to_datetime(df['Timestamp']).dt.strftime('%Y-%m-%d')
+        if full_reload:
+            self.rows, self.keys = {}, []
+            self.window = get_window_index(datetime.now())
+        self._add(rows, self.keys)
+    
+    @staticmethod
+    def rotate(storage, df, watermark):
+        """
+        Delete the leading rows of past windows from the sheet.
         
-        return df
-    except Exception as e:
-        return pd.DataFrame(columns=['Name', 'Score', 'Time_Taken', 'Questions_Total', 'Timestamp', 'Date'])
+        Rows are appended in time order, so past windows form a prefix; new
+        submissions land at the end and are never touched. Right before the
+        delete the prefix is read again, and if it no longer holds the rows
+        counted in df (another process rotated first, or rows were edited)
+        nothing is deleted. Sheets has no conditional delete, so two
+        processes rotating in the same instant could still both delete:
+        enable ROTATE_LEADERBOARD in one process only. Returns the re-read
+        (now one-window) sheet and its watermark.
+        """
+        current = in_current_window(df).to_numpy()
+        n_old = int(current.argmax()) if current.any() else len(df)
+        if not n_old:
+            return df, watermark
+        
+        def fingerprint(rows):
+            columns = [col for col in ('Submission_ID', 'Name', 'Timestamp') if col in rows.columns]
+            return rows[columns].astype(object).where(rows[columns].notna(), None).values.tolist()
+        
+        try:
+            if fingerprint(storage.read_first("Leaderboard", n_old)) != fingerprint(df.iloc[:n_old]):
+                get_metrics().inc('leaderboard_rotations_skipped_total')
+                return storage.read_since("Leaderboard", 0)  # df is stale; start from the sheet as it is
+            storage.delete_first_rows("Leaderboard", n_old)
+        except Exception:
+            return df, watermark  # Retry on the next full reload
+        get_metrics().inc('leaderboard_rows_rotated_total', n_old)
+        return storage.read_since("Leaderboard", 0)
+    
+    def _pending_keys(self, pending):
+        """Sort keys for queued rows that aren't loaded yet."""
+        keys = []
+        for i, (name, score, time_taken, submission_id) in enumerate(self.clean(pd.DataFrame(pending))):
+            if submission_id not in self.submission_ids:
+                keys.append(self.rank_key(score, time_taken) + (-1 - i, (name, score, time_taken)))
+        return sorted(keys)
+    
+    def top(self, k, pending=()):
+        """Return the best k rows (queued rows included) as a DataFrame."""
+        with self.lock:
+            pending_keys = self._pending_keys(pending)
+            stored = [key + (self.rows[key[2]],) for key in self.keys[:k]]
+        
+        best = heapq.merge(stored, pending_keys, key=lambda key: key[:2])
+        rows = [key[3] for key in list(best)[:k]]
+        return pd.DataFrame(rows, columns=['Name', 'Score', 'Time_Taken'])
+    
+    def rank(self, score, time_taken, pending=()):
+        """
+        Return (rank, total) for a score: 1 + the number of strictly better
+        rows, out of all rows (queued rows included). Ties share a rank.
+        """
+        key = self.rank_key(score, time_taken)
+        with self.lock:
+            pending_keys = self._pending_keys(pending)
+            better = bisect.bisect_left(self.keys, key)
+            total = len(self.keys) + len(pending_keys)
+        better += bisect.bisect_left([pending_key[:2] for pending_key in pending_keys], key)
+        return better + 1, total
 
 
-# ============================================================================
-# ADVANCED STATS CALCULATIONS
-# ============================================================================
-def calculate_sharpshooter(df):
+@st.cache_resource
+def get_leaderboard_ranking():
+    """Create the process-wide ranked Leaderboard."""
+    return LeaderboardRanking()
+
+
+def get_pending_window_rows():
+    """Queued Leaderboard rows of the current window."""
+    window = get_window_key(datetime.now())
+    return [
+        entry for entry in get_submission_queue().pending_rows("Leaderboard")
+        if entry.get('Window') == window
+    ]
+
+
+def get_top_leaderboard(conn, k=10):
+    """Fetch the current window's top k Leaderboard rows, including queued scores."""
+    ranking = get_leaderboard_ranking()
+    refresh_or_serve_stale(ranking, conn)
+    return ranking.top(k, get_pending_window_rows())
+
+
+def get_leaderboard_rank(conn, score, time_taken):
+    """Return (rank, total) for a score in the current window, including queued scores."""
+    ranking = get_leaderboard_ranking()
+    refresh_or_serve_stale(ranking, conn)
+    return ranking.rank(score, time_taken, get_pending_window_rows())
+
+
+def normalize_player_name(name):
+    """Player index key: case- and whitespace-insensitive ("Bob  Smith " == "bob smith")."""
+    if not isinstance(name, str):
+        return ''
+    return ' '.join(name.split()).casefold()
+
+
+def build_player_index(names, offset=0):
+    """Map normalized name -> row positions (offset added) for a Series of names."""
+    keys = names.map(normalize_player_name)
+    return {
+        key: positions + offset
+        for key, positions in keys.groupby(keys, sort=False).indices.items()
+        if key
+    }
+
+
+def normalize_history(df):
+    """Clean raw Global_History rows for stats calculations."""
+    df = df.dropna(how='all')
+    
+    # Ensure Questions_Total exists and handle missing values (assume 5 for old data)
+    if 'Questions_Total' not in df.columns:
+        df['Questions_Total'] = 5
+    else:
+        df['Questions_Total'] = df['Questions_Total'].fillna(5)
+    
+    # Ensure Date column exists
+    if 'Date' not in df.columns and 'Timestamp' in df.columns:
+        df['Date'] = pd.to_datetime(df['Timestamp']).dt.strftime('%Y-%m-%d')
+    
+    return df
+
+
+def write_history_snapshot(path, df, backend, watermark):
+    """
+    Write normalized history to an Arrow IPC file, tagged with the storage
+    identity (backend and spreadsheet/database) and the watermark the rows
+    were read up to.
+    """
+    # Store numeric columns as numbers (unparseable values become missing, as
+    # the stats treat them anyway) and any other mixed column as strings
+    df = df.copy()
+    for col in df.columns:
+        if TABLE_SCHEMAS['Global_History'].get(col) == 'INTEGER':
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        elif df[col].dtype == object:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'trivia'] = json.dumps({'backend': backend, 'watermark': watermark}).encode()
+    table = table.replace_schema_metadata(metadata)
+    
+    # Write then rename so a crash never leaves a half-written snapshot
+    tmp_path = path + '.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def read_history_snapshot(path, backend):
+    """
+    Memory-map a history snapshot.
+    
+    Returns (df, watermark), or None if there is no snapshot for this storage
+    identity.
+    """
+    if not os.path.exists(path):
+        return None
+    
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+        metadata = json.loads(table.schema.metadata[b'trivia'])
+        if metadata['backend'] != backend:
+            return None
+        return table.to_pandas(), metadata['watermark']
+
+
+class HistoryLoader(IncrementalLoader):
     """
-    Calculate accuracy stats for each user.
-    Formula: (Sum of all User's Scores / Sum of all User's Questions_Total) * 100
+    Incrementally loaded copy of Global_History.
+    
+    The sheet is append-only, so the loader keeps the already-normalized
+    frame in memory together with a row watermark and only fetches rows
+    added since the last refresh. Refresh cost scales with new submissions
+    rather than total history.
+    
+    The frame is also saved as a columnar snapshot (HISTORY_SNAPSHOT_PATH,
+    next to app.py), tagged with the storage identity it was read from.
+    After a restart the first refresh memory-maps it and only fetches the
+    rows added since, instead of downloading the whole sheet. A snapshot
+    from another spreadsheet or database is ignored.
+    
+    A player index (normalized name -> row positions) is kept alongside, so
+    one player's games are a positional lookup rather than a scan.
+    """
+    
+    WORKSHEET = "Global_History"
+    CACHE = 'history'
+    
+    def __init__(self, snapshot_path=HISTORY_SNAPSHOT_PATH):
+        super().__init__()
+        # Relative paths are anchored next to app.py, not the working directory
+        self.snapshot_path = snapshot_path and os.path.join(APP_DIR, snapshot_path)
+        self.last_snapshot = 0.0
+        self.df = pd.DataFrame(columns=HISTORY_COLUMNS)
+        self.aggregates = HallOfFameAggregates()
+        self.version = 0  # Bumped whenever the loaded rows change
+        self.player_rows = {}  # normalize_player_name(Name) -> row positions in df
+    
+    def before_refresh(self, storage, now):
+        """On the first refresh, start from the snapshot."""
+        if not self.last_refresh and self.snapshot_path:
+            self.load_snapshot(storage.identity(), now)
+    
+    def load(self, rows, full_reload):
+        """Append the normalized rows and fold them into the aggregates and player index."""
+        if not rows.empty:
+            rows = normalize_history(rows).reset_index(drop=True)
+        
+        if full_reload:
+            self.df = rows if not rows.empty else pd.DataFrame(columns=HISTORY_COLUMNS)
+            self.aggregates = HallOfFameAggregates()
+            self.aggregates.update(self.df)
+            self.player_rows = build_player_index(self.df['Name'])
+            self.version += 1
+        elif not rows.empty:
+            offset = len(self.df)
+            self.df = rows if self.df.empty else pd.concat([self.df, rows], ignore_index=True)
+            self.aggregates.update(rows)
+            for key, positions in build_player_index(rows['Name'], offset).items():
+                known = self.player_rows.get(key)
+                self.player_rows[key] = positions if known is None else np.concatenate([known, positions])
+            self.version += 1
+    
+    def after_refresh(self, storage, rows, full_reload, now):
+        """Rewrite the snapshot after a full reload, or at most every HISTORY_SNAPSHOT_SECONDS."""
+        if self.snapshot_path and (full_reload or (
+            not rows.empty and now - self.last_snapshot >= HISTORY_SNAPSHOT_SECONDS
+        )):
+            self.save_snapshot(storage.identity(), now)
+    
+    def load_snapshot(self, backend, now):
+        """Start from the saved snapshot, if there is one for this backend."""
+        try:
+            snapshot = read_history_snapshot(self.snapshot_path, backend)
+        except Exception:
+            return  # Unreadable snapshot; fall back to a full load
+        if snapshot is None:
+            return
+        
+        df, watermark = snapshot
+        self.submission_ids = set()
+        self.df = drop_duplicate_submissions(df, self.submission_ids).reset_index(drop=True)
+        self.aggregates = HallOfFameAggregates()
+        self.aggregates.update(self.df)
+        self.player_rows = build_player_index(self.df['Name'])
+        self.watermark = watermark
+        self.last_full_reload = now  # The next full reload is on the usual schedule
+        self.last_snapshot = now
+        self.version += 1
+    
+    def player_history(self, name):
+        """Return a copy of one player's loaded rows, via the player index."""
+        with self.lock:
+            positions = self.player_rows.get(normalize_player_name(name))
+            if positions is None:
+                return self.df.iloc[0:0].copy()
+            return self.df.iloc[positions].copy()
+    
+    def save_snapshot(self, backend, now):
+        """Save the loaded rows and watermark (failures only cost a slower restart)."""
+        try:
+            write_history_snapshot(self.snapshot_path, self.df, backend, self.watermark)
+            self.last_snapshot = now
+        except Exception:
+            pass
+
+
+@st.cache_resource
+def get_history_loader():
+    """Create the process-wide incremental Global_History loader."""
+    return HistoryLoader()
+
+
+def get_hall_of_fame_table(conn, table):
     """
-    if df.empty:
-        return pd.DataFrame(columns=['Name', 'Accuracy', 'Total_Correct', 'Total_Questions', 'Games_Played'])
+    Fetch one Hall of Fame table ('sharpshooter', 'speed_demon', 'monthly'
+    or 'all_streaks') from the materialized aggregates, including queued scores.
     
-    # Ensure numeric types
-    df['Score'] = pd.to_numeric(df['Score'], errors='coerce').fillna(0)
-    df['Questions_Total'] = pd.to_numeric(df['Questions_Total'], errors='coerce').fillna(5)
+    Tables are computed once per history version and shared by every session.
+    """
+    loader = get_history_loader()
+    refresh_or_serve_stale(loader, conn)
     
-    # Group by user
-    stats = df.groupby('Name').agg({
-        'Score': 'sum',
-        'Questions_Total': 'sum',
-        'Name': 'count'
-    }).rename(columns={'Name': 'Games_Played', 'Score': 'Total_Correct', 'Questions_Total': 'Total_Questions'})
+    queue = get_submission_queue()
     
-    # Calculate accuracy
-    stats['Accuracy'] = (stats['Total_Correct'] / stats['Total_Questions'] * 100).round(1)
+    # Monthly and streak tables also depend on today's date
+    version = (loader.version, queue.version, datetime.now().strftime('%Y-%m-%d'))
     
-    # Sort by accuracy (desc), then by games played (desc) for tiebreaker
-    stats = stats.sort_values(by=['Accuracy', 'Games_Played'], ascending=[False, False])
+    def compute():
+        aggregates = loader.aggregates
+        # Rows can be stored and still in flight for a moment; count them once
+        pending = [
+            entry for entry in queue.pending_rows("Global_History")
+            if entry.get('Submission_ID') not in loader.submission_ids
+        ]
+        if pending:
+            aggregates = aggregates.with_rows(pd.DataFrame(pending))
+        return getattr(aggregates, table)()
     
-    return stats.reset_index()
+    return get_stats_cache().get(version, table, compute)
 
 
-def calculate_speed_demon(df):
-    """
-    Calculate average time stats for each user.
-    Lower average time = faster = better.
+def get_player_profile(conn, name):
     """
-    if df.empty:
-        return pd.DataFrame(columns=['Name', 'Avg_Time', 'Avg_Score', 'Fastest_Time', 'Games_Played'])
-    
-    # Ensure numeric types
-    df['Time_Taken'] = pd.to_numeric(df['Time_Taken'], errors='coerce').fillna(60)
-    df['Score'] = pd.to_numeric(df['Score'], errors='coerce').fillna(0)
-    
-    # Group by user
-    stats = df.groupby('Name').agg({
-        'Time_Taken': ['mean', 'min', 'count'],
-        'Score': 'mean'
-    })
-    
-    stats.columns = ['Avg_Time', 'Fastest_Time', 'Games_Played', 'Avg_Score']
-    stats['Avg_Time'] = stats['Avg_Time'].round(1)
-    stats['Avg_Score'] = stats['Avg_Score'].round(1)
+    Career profile of one player (all spellings of the name that normalize
+    the same), including games still in the write queue.
     
-    # Reorder columns: Avg_Time, Avg_Score, Fastest_Time, Games_Played
-    stats = stats[['Avg_Time', 'Avg_Score', 'Fastest_Time', 'Games_Played']]
-    
-    # Sort by average time (asc) - faster is better
-    stats = stats.sort_values(by='Avg_Time', ascending=True)
-    
-    return stats.reset_index()
+    Returns a dict of stats and recent games, or None if they haven't played.
+    """
+    loader = get_history_loader()
+    refresh_or_serve_stale(loader, conn)
+    
+    key = normalize_player_name(name)
+    rows = loader.player_history(name)
+    pending = [
+        entry for entry in get_submission_queue().pending_rows("Global_History")
+        if normalize_player_name(entry.get('Name')) == key
+        and entry.get('Submission_ID') not in loader.submission_ids
+    ]
+    if pending:
+        pending_df = normalize_history(pd.DataFrame(pending))
+        rows = pending_df if rows.empty else pd.concat([rows, pending_df], ignore_index=True)
+    if rows.empty:
+        return None
+    
+    # Same cleaning as the Hall of Fame tables
+    scores = pd.to_numeric(rows['Score'], errors='coerce').fillna(0)
+    questions = pd.to_numeric(rows['Questions_Total'], errors='coerce').fillna(5)
+    times = pd.to_numeric(rows['Time_Taken'], errors='coerce').fillna(60)
+    dates = pd.to_datetime(rows['Date'], errors='coerce')
+    streaks = current_streaks(pd.Series(key, index=rows.index), dates)
+    
+    history = pd.DataFrame({
+        'Date': rows['Timestamp'] if 'Timestamp' in rows.columns else rows['Date'],
+        'Score': scores.astype(int).astype(str) + '/' + questions.astype(int).astype(str),
+        'Time (s)': times.astype(int)
+    }).sort_values('Date', ascending=False)
+    
+    return {
+        'games': len(rows),
+        'accuracy': round(scores.sum() / questions.sum() * 100, 1) if questions.sum() else 0.0,
+        'avg_time': round(times.mean(), 1),
+        'best_time': int(times.min()),
+        'streak': int(streaks.get(key, 0)),
+        'history': history.reset_index(drop=True)
+    }
 
 
-def calculate_monthly_leaderboard(df):
+# ============================================================================
+# WRITE-BEHIND SUBMISSION QUEUE
+# ============================================================================
+class SubmissionQueue:
     """
-    Filter data to current month and calculate monthly stats.
+    Process-wide write-behind queue for score rows.
+    
+    Submissions are acknowledged as soon as they are queued. A background
+    thread flushes them every WRITE_FLUSH_SECONDS (or as soon as
+    WRITE_BATCH_SIZE rows are waiting) with one append per worksheet, so a
+    burst of players finishing together costs a handful of API calls instead
+    of several per player. The worksheets of a batch are written in parallel,
+    so a flush takes as long as the slowest append rather than their sum.
+    Failed flushes are retried with exponential backoff and the rows stay
+    queued until they are written; status() reports progress per submission.
+    
+    Rows are keyed by Submission_ID: a row whose ID is already queued or was
+    recently written is ignored, and retries only append rows the worksheet
+    doesn't already hold, so neither reruns nor half-failed writes duplicate
+    a score.
     """
-    if df.empty:
-        return pd.DataFrame(columns=['Name', 'Total_Score', 'Avg_Score', 'Games_Played'])
     
-    # Parse dates
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    
-    # Filter to current month
-    now = datetime.now()
-    current_month = df[
-        (df['Date'].dt.year == now.year) & 
-        (df['Date'].dt.month == now.month)
-    ]
-    
-    if current_month.empty:
-        return pd.DataFrame(columns=['Name', 'Total_Score', 'Avg_Score', 'Games_Played'])
-    
-    # Ensure numeric
-    current_month['Score'] = pd.to_numeric(current_month['Score'], errors='coerce').fillna(0)
-    
-    # Group by user
-    stats = current_month.groupby('Name').agg({
-        'Score': ['sum', 'mean', 'count']
-    })
-    
-    stats.columns = ['Total_Score', 'Avg_Score', 'Games_Played']
-    stats['Avg_Score'] = stats['Avg_Score'].round(1)
-    stats['Total_Score'] = stats['Total_Score'].astype(int)
-    
-    # Sort by total score (desc)
-    stats = stats.sort_values(by='Total_Score', ascending=False)
+    RECENT_IDS = 10000  # Written Submission_IDs remembered per worksheet
+    
+    def __init__(self, get_storage):
+        self.get_storage = get_storage  # Resolved on every flush
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.queue = []  # (worksheet, entry) in submission order
+        self.inflight = []  # Batch currently being written
+        self.written = OrderedDict()  # (worksheet, Submission_ID) of recent writes
+        self.version = 0  # Bumped whenever the pending rows change
+        self.failures = 0
+        self.last_error = None  # Error of the last failed flush, for status()
+        self.pool = ThreadPoolExecutor(max_workers=len(SUBMISSION_TABLES), thread_name_prefix='flush')
+        threading.Thread(target=self._run, daemon=True).start()
+        atexit.register(self.flush)
+    
+    def put(self, worksheet, entry):
+        """Queue a row for writing. Returns False if its Submission_ID was already seen."""
+        key = (worksheet, entry.get('Submission_ID'))
+        with self.lock:
+            if key[1] and (key in self.written or any(
+                name == worksheet and queued.get('Submission_ID') == key[1]
+                for name, queued in self.inflight + self.queue
+            )):
+                return False
+            self.queue.append((worksheet, entry))
+            self.version += 1
+            if len(self.queue) >= WRITE_BATCH_SIZE:
+                self.wake.set()
+            return True
+    
+    def status(self, submission_id):
+        """
+        Return (pending, error) for a submission: whether any of its rows are
+        still waiting to be written, and the last write error if retrying.
+        """
+        with self.lock:
+            pending = any(
+                entry.get('Submission_ID') == submission_id
+                for _, entry in self.inflight + self.queue
+            )
+            return pending, (self.last_error if pending and self.failures else None)
+    
+    def pending_rows(self, worksheet):
+        """Return the rows still waiting to be written to a worksheet."""
+        with self.lock:
+            return [entry for name, entry in self.inflight + self.queue if name == worksheet]
+    
+    def _run(self):
+        while True:
+            self.wake.wait(timeout=WRITE_FLUSH_SECONDS)
+            self.wake.clear()
+            if not self.flush() and self.failures:
+                time.sleep(min(2 ** self.failures, WRITE_MAX_BACKOFF_SECONDS))
+    
+    def flush(self):
+        """Write all queued rows. Returns True if nothing is left queued."""
+        with self.lock:
+            batch, self.queue = self.queue, []
+            self.inflight = batch
+        if not batch:
+            return True
+        
+        # Group rows by worksheet, keeping submission order within each
+        by_worksheet = {}
+        for worksheet, entry in batch:
+            by_worksheet.setdefault(worksheet, []).append(entry)
+        
+        storage, error = self.get_storage()
+        
+        def write(worksheet, entries):
+            if error:
+                raise RuntimeError(error)
+            if self.failures:
+                # A failed attempt may still have landed; merge instead of duplicating
+                storage.append_unique(worksheet, entries)
+            else:
+                storage.append(worksheet, entries)
+        
+        def submit(worksheet, entries):
+            try:
+                return self.pool.submit(write, worksheet, entries)
+            except RuntimeError:
+                # The pool is shut down before the atexit flush runs; write inline
+                future = Future()
+                try:
+                    write(worksheet, entries)
+                    future.set_result(None)
+                except Exception as e:
+                    future.set_exception(e)
+                return future
+        
+        # One append per worksheet, all in flight at once
+        futures = {
+            worksheet: submit(worksheet, entries)
+            for worksheet, entries in by_worksheet.items()
+        }
+        failed = []
+        for worksheet, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                failed.extend((worksheet, entry) for entry in by_worksheet[worksheet])
+                self.last_error = str(e)
+        
+        with self.lock:
+            # Put failed rows back at the front so ordering is preserved
+            self.queue = failed + self.queue
+            self.inflight = []
+            self.version += 1
+            
+            failed_ids = {id(entry) for _, entry in failed}
+            for worksheet, entry in batch:
+                if id(entry) not in failed_ids and entry.get('Submission_ID'):
+                    self.written[(worksheet, entry['Submission_ID'])] = True
+            while len(self.written) > self.RECENT_IDS:
+                self.written.popitem(last=False)
+        
+        if not failed:
+            self.failures = 0
+            return True
+        self.failures += 1
+        return False
+
+
+@st.cache_resource
+def get_submission_queue():
+    """Create the process-wide write-behind queue."""
+    return SubmissionQueue(get_connection)
+
+
+# ============================================================================
+# PLAY WINDOWS & STREAKS
+# ============================================================================
+# Play windows start on each release day and run until the next one
+RELEASE_DAYS = sorted(set(QUIZ_DAYS))
+WEEKDAY_NAMES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def get_window_start(date):
+    """
+    Return (release date, position in RELEASE_DAYS) of the window a date is in.
     
-    return stats.reset_index()
+    The window starts on the most recent release day on or before the date,
+    which can be in the previous week.
+    """
+    weekday = date.weekday()  # Monday=0, Sunday=6
+    position = bisect.bisect_right(RELEASE_DAYS, weekday) - 1
+    if position < 0:
+        position = len(RELEASE_DAYS) - 1  # Before this week's first release
+    return date - timedelta(days=(weekday - RELEASE_DAYS[position]) % 7), position
 
 
 def get_play_window(date):
     """
     Determine which play window a date falls into.
     
+    Windows follow QUIZ_DAYS: each starts on a release day and lasts until
+    the next. With the default [0, 4]:
     Window A (Early Week): Monday (0) through Thursday (3)
     Window B (Weekend): Friday (4) through Sunday (6)
     
-    Returns a tuple of (year, week_number, window_letter) for comparison.
+    Returns a tuple of (year, week_number, window_letter) for comparison,
+    with the ISO week of the window's release day.
     """
     if isinstance(date, str):
         date = pd.to_datetime(date).date()
     elif hasattr(date, 'date'):
         date = date.date()
     
-    weekday = date.weekday()  # Monday=0, Sunday=6
-    year, week_num, _ = date.isocalendar()
-    
-    if weekday <= 3:  # Monday-Thursday = Window A
-        return (year, week_num, 'A')
-    else:  # Friday-Sunday = Window B
-        return (year, week_num, 'B')
+    start, position = get_window_start(date)
+    year, week_num, _ = start.isocalendar()
+    return (year, week_num, chr(ord('A') + position))
 
 
-def get_all_windows_in_order():
-    """
-    Generate a list of all possible windows from a start date to now,
-    in reverse chronological order (most recent first).
+def get_window_index(date):
     """
-    windows = []
-    current_date = datetime.now().date()
+    Return the play window of a date as a sequential integer.
     
-    # Go back about 1 year (52 weeks * 2 windows)
-    start_date = current_date - timedelta(days=365)
+    Consecutive windows (Mon-Thu, Fri-Sun, next Mon-Thu, ...) get consecutive
+    numbers, so streaks can be counted with plain integer arithmetic.
+    """
+    if isinstance(date, str):
+        date = pd.to_datetime(date).date()
+    elif hasattr(date, 'date'):
+        date = date.date()
     
-    # Generate all windows
-    check_date = start_date
-    while check_date <= current_date:
-        window = get_play_window(check_date)
-        if window not in windows:
-            windows.append(window)
-        check_date += timedelta(days=1)
+    # date.toordinal() is 1 for Monday 0001-01-01
+    start, position = get_window_start(date)
+    week = (start.toordinal() - 1) // 7
+    return week * len(RELEASE_DAYS) + position
+
+
+def get_window_key(date):
+    """Return the play window of a date as a sheet-friendly key, e.g. '2025-W07-B'."""
+    year, week_num, letter = get_play_window(date)
+    return f"{year}-W{week_num:02d}-{letter}"
+
+
+def describe_play_windows():
+    """The play windows as weekday ranges, e.g. 'Mon-Thu & Fri-Sun'."""
+    ranges = []
+    for position, first in enumerate(RELEASE_DAYS):
+        last = (RELEASE_DAYS[(position + 1) % len(RELEASE_DAYS)] - 1) % 7
+        ranges.append(WEEKDAY_NAMES[first] if first == last else f"{WEEKDAY_NAMES[first]}-{WEEKDAY_NAMES[last]}")
+    return ' & '.join(ranges)
+
+
+# Any Monday works as the origin; this one keeps indexes equal to get_window_index()
+WINDOW_EPOCH = pd.Timestamp('1970-01-05')
+WINDOW_EPOCH_WEEK = (WINDOW_EPOCH.toordinal() - 1) // 7
+
+
+def get_window_indexes(dates):
+    """Vectorized get_window_index() for a datetime Series (NaT stays missing)."""
+    days = (dates.dt.normalize() - WINDOW_EPOCH).dt.days
+    weekdays = (days % 7).fillna(0).to_numpy()
+    positions = pd.Series(np.searchsorted(RELEASE_DAYS, weekdays, side='right') - 1, index=days.index)
+    
+    # Before this week's first release: last week's final window
+    wrapped = positions < 0
+    weeks = days // 7 + WINDOW_EPOCH_WEEK - wrapped
+    positions = positions.where(~wrapped, len(RELEASE_DAYS) - 1)
+    return weeks * len(RELEASE_DAYS) + positions
+
+
+def in_current_window(df, now=None):
+    """
+    Boolean mask of the Leaderboard rows played in the current window.
     
-    # Return in reverse order (most recent first)
-    return list(reversed(windows))
+    Rows are matched on their Window key; older rows without one fall back
+    to their Timestamp.
+    """
+    now = now or datetime.now()
+    if 'Window' in df.columns:
+        windows = df['Window']
+    else:
+        windows = pd.Series(None, index=df.index, dtype=object)
+    mask = windows == get_window_key(now)
+    
+    untagged = windows.isna() | (windows == '')
+    if untagged.any() and 'Timestamp' in df.columns:
+        played = get_window_indexes(pd.to_datetime(df.loc[untagged, 'Timestamp'], errors='coerce'))
+        mask[untagged] = played == get_window_index(now)
+    return mask
 
 
-def calculate_streak(df, user_name):
+def current_streaks(names, dates, now=None):
     """
-    Calculate a user's consecutive play streak using the window system.
+    Compute every player's current streak in a single vectorized pass.
     
-    Window A (Early Week): Monday through Thursday
-    Window B (Weekend): Friday through Sunday
+    Each row is mapped to its play window once. A streak is the run of
+    consecutive windows ending at the current window, or at the previous one
+    (one-window grace period), counting back no further than a year.
     
-    A user maintains their streak if they have at least one submission
-    in consecutive windows.
+    Returns a Series of streak lengths indexed by name (players with no
+    current streak are omitted).
+    """
+    today = (now or datetime.now()).date()
+    current = get_window_index(today)
+    oldest = get_window_index(today - timedelta(days=365))
+    
+    played = pd.DataFrame({'Name': names, 'Window': get_window_indexes(dates)}).dropna()
+    played = played[(played['Window'] >= oldest) & (played['Window'] <= current)]
+    played = played.drop_duplicates().sort_values(['Name', 'Window'], ascending=[True, False])
+    if played.empty:
+        return pd.Series(dtype=int)
+    
+    # Windows are unique and descending per player, so the k-th row is part of
+    # the run ending at the latest window exactly when Window + k == latest
+    grouped = played.groupby('Name', sort=False)['Window']
+    latest = grouped.transform('max')
+    in_run = played['Window'] + grouped.cumcount() == latest
+    streaks = in_run.groupby(played['Name'], sort=False).sum()
+    
+    # Only runs ending in the current or grace window count
+    latest = grouped.max()
+    return streaks[latest >= current - 1].astype(int)
+
+
+# ============================================================================
+# MATERIALIZED HALL OF FAME STATS
+# ============================================================================
+class HallOfFameAggregates:
+    """
+    Hall of Fame stats, maintained incrementally in month partitions.
+    
+    History rows are pre-aggregated per (month, player): score, question and
+    time sums, fastest time, game count and last play date. The monthly table
+    reads only the current month's partition, and career tables combine the
+    partitions (months x players rows) instead of rescanning raw history.
+    Streak state (play windows and the run ending at the latest one) is kept
+    per player. New rows are folded in with update(), and the tables returned
+    match the full-history reference implementations (the calculate_*
+    functions in benchmarks/reference_stats.py).
     """
-    if df.empty:
-        return 0
     
-    # Get this user's play dates
-    user_df = df[df['Name'] == user_name].copy()
-    if user_df.empty:
-        return 0
+    PARTITION_COLUMNS = ['score_sum', 'questions_sum', 'time_sum', 'fastest_time', 'games', 'last_played']
+    
+    def __init__(self):
+        self.partitions = {}  # (year, month), or None for undated rows -> per-player frame
+        self.names = {}  # Every player, in order of first appearance
+        self.windows = {}  # name -> frozenset of play-window indexes
+        self.streaks = {}  # name -> (latest window index, consecutive windows ending there)
+        self.career_cache = None  # (partitions dict it was built from, career frame)
+    
+    def with_rows(self, df):
+        """Return a copy that also includes df, leaving this instance untouched."""
+        view = HallOfFameAggregates()
+        view.partitions = self.partitions
+        view.names = self.names
+        view.windows = self.windows
+        view.streaks = self.streaks
+        view.update(df)
+        return view
+    
+    @timed
+    def update(self, df):
+        """
+        Fold new history rows into the aggregates.
+        
+        The new state is built aside and published by assignment, never
+        modified in place, so copies made by with_rows() never see each
+        other's updates and readers running without the loader's lock never
+        see a half-applied update: streaks are published before windows and
+        names, so every name a reader can find already has its streak, and
+        career() never pairs a cached frame with partitions it wasn't built from.
+        """
+        df = df.dropna(subset=['Name']) if 'Name' in df.columns else df.iloc[0:0]
+        if df.empty:
+            return
+        
+        # Same cleaning as the calculate_* functions
+        dates = pd.to_datetime(df['Date'], errors='coerce')
+        rows = pd.DataFrame({
+            'Name': df['Name'],
+            'Score': pd.to_numeric(df['Score'], errors='coerce').fillna(0),
+            'Questions_Total': pd.to_numeric(df['Questions_Total'], errors='coerce').fillna(5),
+            'Time_Taken': pd.to_numeric(df['Time_Taken'], errors='coerce').fillna(60),
+            'Date': dates,
+            'Year': dates.dt.year.fillna(0).astype(int),
+            'Month': dates.dt.month.fillna(0).astype(int)
+        })
+        
+        new_names = [name for name in rows['Name'].unique() if name not in self.names]
+        all_names = {**self.names, **dict.fromkeys(new_names)} if new_names else self.names
+        
+        # Per (month, player) pre-aggregates, merged into each touched partition
+        grouped = rows.groupby(['Year', 'Month', 'Name'], sort=False).agg(
+            score_sum=('Score', 'sum'),
+            questions_sum=('Questions_Total', 'sum'),
+            time_sum=('Time_Taken', 'sum'),
+            fastest_time=('Time_Taken', 'min'),
+            games=('Score', 'count'),
+            last_played=('Date', 'max')
+        )
+        partitions = dict(self.partitions)
+        for (year, month), part in grouped.groupby(level=['Year', 'Month'], sort=False):
+            key = (year, month) if year else None
+            part = part.droplevel(['Year', 'Month'])
+            current = partitions.get(key)
+            if current is not None:
+                part = self.combine([current, part])
+            partitions[key] = part
+        
+        dated = rows.dropna(subset=['Date'])
+        if dated.empty:
+            self.partitions = partitions
+            self.names = all_names
+            return
+        
+        # Play windows per player, merged with what is already known
+        played = pd.DataFrame({'Name': dated['Name'], 'Window': get_window_indexes(dated['Date'])})
+        known = [
+            (name, window)
+            for name in played['Name'].unique() if name in self.windows
+            for window in self.windows[name]
+        ]
+        if known:
+            played = pd.concat([played, pd.DataFrame(known, columns=['Name', 'Window'])], ignore_index=True)
+        played = played.drop_duplicates().sort_values(['Name', 'Window'], ascending=[True, False])
+        
+        # Rows are grouped by name, so each player's windows are one slice
+        names = played['Name'].to_numpy()
+        windows = played['Window'].to_numpy()
+        bounds = np.flatnonzero(np.r_[True, names[1:] != names[:-1], True])
+        player_windows = {
+            names[start]: frozenset(windows[start:end].tolist())
+            for start, end in zip(bounds[:-1], bounds[1:])
+        }
+        
+        # Streak state: windows are unique and descending per player, so the
+        # k-th one continues the run ending at the latest exactly when
+        # Window + k == latest (as in current_streaks)
+        by_name = played.groupby('Name', sort=False)['Window']
+        latest = by_name.transform('max')
+        runs = (played['Window'] + by_name.cumcount() == latest).groupby(played['Name'], sort=False).sum()
+        streaks = {**self.streaks, **dict(zip(runs.index, zip(by_name.max().reindex(runs.index), runs)))}
+        
+        # Publish: each dict only gains keys, so in this order readers never
+        # find a name in names or windows without its streak
+        self.partitions = partitions
+        self.streaks = streaks
+        self.windows = {**self.windows, **player_windows}
+        self.names = all_names
+    
+    @staticmethod
+    def combine(parts):
+        """Merge per-player pre-aggregate frames."""
+        return pd.concat(parts).groupby(level=0, sort=False).agg({
+            'score_sum': 'sum',
+            'questions_sum': 'sum',
+            'time_sum': 'sum',
+            'fastest_time': 'min',
+            'games': 'sum',
+            'last_played': 'max'
+        })
     
-    user_df['Date'] = pd.to_datetime(user_df['Date'], errors='coerce')
-    user_dates = user_df['Date'].dropna().dt.date.unique()
+    @timed
+    def career(self):
+        """Career totals per player, combined from every partition."""
+        partitions = self.partitions
+        cached = self.career_cache
+        if cached is not None and cached[0] is partitions:
+            return cached[1]
+        
+        if partitions:
+            career = self.combine(list(partitions.values()))
+        else:
+            career = pd.DataFrame(columns=self.PARTITION_COLUMNS)
+        # Tagged with the partitions it came from; a later update() invalidates it
+        self.career_cache = (partitions, career)
+        return career
+    
+    @timed
+    def sharpshooter(self):
+        """Accuracy table, as calculate_sharpshooter()."""
+        career = self.career()
+        if career.empty:
+            return pd.DataFrame(columns=['Name', 'Accuracy', 'Total_Correct', 'Total_Questions', 'Games_Played'])
+        
+        stats = pd.DataFrame({
+            'Total_Correct': career['score_sum'],
+            'Total_Questions': career['questions_sum'],
+            'Games_Played': career['games']
+        }).rename_axis('Name').sort_index()
+        
+        stats['Accuracy'] = (stats['Total_Correct'] / stats['Total_Questions'] * 100).round(1)
+        stats = stats.sort_values(by=['Accuracy', 'Games_Played'], ascending=[False, False])
+        
+        return stats.reset_index()
+    
+    @timed
+    def speed_demon(self):
+        """Average time table, as calculate_speed_demon()."""
+        career = self.career()
+        if career.empty:
+            return pd.DataFrame(columns=['Name', 'Avg_Time', 'Avg_Score', 'Fastest_Time', 'Games_Played'])
+        
+        stats = pd.DataFrame({
+            'Avg_Time': career['time_sum'] / career['games'],
+            'Avg_Score': career['score_sum'] / career['games'],
+            'Fastest_Time': career['fastest_time'],
+            'Games_Played': career['games']
+        }).rename_axis('Name').sort_index()
+        
+        stats['Avg_Time'] = stats['Avg_Time'].round(1)
+        stats['Avg_Score'] = stats['Avg_Score'].round(1)
+        stats = stats.sort_values(by='Avg_Time', ascending=True)
+        
+        return stats.reset_index()
+    
+    @timed
+    def monthly(self, now=None):
+        """Current month table, as calculate_monthly_leaderboard(), from one partition."""
+        now = now or datetime.now()
+        part = self.partitions.get((now.year, now.month))
+        if part is None or part.empty:
+            return pd.DataFrame(columns=['Name', 'Total_Score', 'Avg_Score', 'Games_Played'])
+        
+        stats = pd.DataFrame({
+            'Total_Score': part['score_sum'],
+            'Avg_Score': part['score_sum'] / part['games'],
+            'Games_Played': part['games']
+        }).rename_axis('Name').sort_index()
+        
+        stats['Avg_Score'] = stats['Avg_Score'].round(1)
+        stats['Total_Score'] = stats['Total_Score'].astype(int)
+        stats = stats.sort_values(by='Total_Score', ascending=False)
+        
+        return stats.reset_index()
     
-    if len(user_dates) == 0:
-        return 0
+    def current_streak(self, name, now=None):
+        """A player's current streak, as calculate_streak()."""
+        if name not in self.windows:
+            return 0
+        
+        today = (now or datetime.now()).date()
+        current = get_window_index(today)
+        oldest = get_window_index(today - timedelta(days=365))
+        latest, run = self.streaks[name]
+        
+        # Fast path: the stored run already ends in the current or grace window
+        if latest in (current, current - 1):
+            return min(run, latest - oldest + 1)
+        if latest < current:
+            return 0
+        
+        # Rows dated in the future: walk back from the current window
+        windows = self.windows[name]
+        start = current if current in windows else current - 1
+        streak = 0
+        while start - streak in windows and start - streak >= oldest:
+            streak += 1
+        return streak
     
-    # Get the windows the user played in
-    user_windows = set()
-    for date in user_dates:
-        user_windows.add(get_play_window(date))
+    @timed
+    def all_streaks(self, now=None):
+        """Streak table, as calculate_all_streaks()."""
+        if not self.names:
+            return pd.DataFrame(columns=['Name', 'Current_Streak', 'Last_Played'])
+        
+        users = pd.Index(list(self.names))
+        last_played = pd.to_datetime(self.career()['last_played']).reindex(users)
+        streak_df = pd.DataFrame({
+            'Name': users,
+            'Current_Streak': [self.current_streak(name, now) for name in users],
+            'Last_Played': last_played.dt.strftime('%Y-%m-%d').fillna('N/A').values
+        })
+        streak_df = streak_df.sort_values(by='Current_Streak', ascending=False)
+        
+        return streak_df.reset_index(drop=True)
+
+
+# ============================================================================
+# SHARED STATS CACHE
+# ============================================================================
+class StatsCache:
+    """
+    Process-wide cache of computed Hall of Fame tables.
     
-    # Get current window
-    current_window = get_play_window(datetime.now().date())
+    Entries are keyed by (history version, table). A newer version evicts
+    everything computed for older ones, and concurrent requests for the same
+    missing table wait for a single computation instead of each doing it.
+    """
     
-    # Get all windows in order (most recent first)
-    all_windows = get_all_windows_in_order()
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.computing = {}  # key -> lock held while it is computed
+        self.version = None
+    
+    def get(self, version, table, compute):
+        """Return the cached table for this version, computing it if needed."""
+        key = (version, table)
+        with self.lock:
+            if self.version is None or version > self.version:
+                # History changed: drop tables computed from older versions
+                self.entries.clear()
+                self.version = version
+            elif version < self.version:
+                # A request that raced a newer version; don't cache stale data
+                return compute()
+            
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                get_metrics().cache_result('stats', hit=True)
+                return self.entries[key]
+            key_lock = self.computing.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            with self.lock:
+                if key in self.entries:
+                    get_metrics().cache_result('stats', hit=True)
+                    return self.entries[key]
+            
+            get_metrics().cache_result('stats', hit=False)
+            value = compute()
+            
+            with self.lock:
+                self.computing.pop(key, None)
+                if version == self.version:
+                    self.entries[key] = value
+                    while len(self.entries) > self.max_entries:
+                        self.entries.popitem(last=False)
+            return value
+
+
+@st.cache_resource
+def get_stats_cache():
+    """Create the process-wide Hall of Fame table cache."""
+    return StatsCache(STATS_CACHE_MAX_ENTRIES)
+
+
+# ============================================================================
+# QUESTION DIFFICULTY
+# ============================================================================
+ANSWER_OPTIONS = 'ABCD-'  # Option counted per answer; '-' is unanswered
+
+
+def unpack_answers(df):
+    """
+    Explode packed Answers rows into one entry per answered question.
     
-    # Find where current window is in the list
-    try:
-        current_idx = all_windows.index(current_window)
-    except ValueError:
-        return 0
+    Returns (question_ids, options, hits) as aligned arrays, where options
+    indexes ANSWER_OPTIONS, plus (lengths, game_scores): the number of
+    questions and the share answered right for each game. Rows whose fields
+    disagree in length are skipped.
+    """
+    ids = df['Question_IDs'].fillna('').astype(str).str.split(',')
+    letters = df['Answers'].fillna('').astype(str)
+    flags = df['Correct'].fillna('').astype(str)
+    
+    lengths = ids.str.len().to_numpy()
+    valid = (lengths > 0) & (letters.str.len().to_numpy() == lengths) & (flags.str.len().to_numpy() == lengths)
+    if not valid.any():
+        empty = np.array([], dtype=np.int64)
+        return np.array([], dtype=object), empty, empty.astype(bool), empty, empty.astype(float)
+    ids, letters, flags, lengths = ids[valid], letters[valid], flags[valid], lengths[valid]
+    
+    question_ids = np.array([i.strip() for row in ids for i in row], dtype=object)
+    chars = np.frombuffer(''.join(letters).upper().encode('ascii', 'replace'), dtype='S1')
+    hits = np.frombuffer(''.join(flags).encode('ascii', 'replace'), dtype='S1') == b'1'
+    
+    # Unknown letters count as unanswered
+    options = np.full(len(chars), len(ANSWER_OPTIONS) - 1)
+    for code, letter in enumerate(ANSWER_OPTIONS[:-1]):
+        options[chars == letter.encode()] = code
+    
+    game_hits = np.add.reduceat(hits.astype(np.int64), np.concatenate([[0], np.cumsum(lengths)[:-1]]))
+    return question_ids, options, hits, lengths, game_hits / lengths
+
+
+class QuestionStats(IncrementalLoader):
+    """
+    Incrementally maintained difficulty stats per question, from Answers.
     
-    # Count consecutive windows starting from current (or most recent played)
-    streak = 0
+    New Answers rows are fetched past a watermark (IncrementalLoader) and
+    added to per-question count arrays with np.add.at, so a refresh costs
+    O(new answers) however long the log gets:
     
-    # First check if they played in current window
-    if current_window in user_windows:
-        streak = 1
-        start_idx = current_idx + 1
-    else:
-        # Check if they played in the previous window (grace period)
-        if current_idx + 1 < len(all_windows):
-            prev_window = all_windows[current_idx + 1]
-            if prev_window in user_windows:
-                streak = 1
-                start_idx = current_idx + 2
-            else:
-                return 0  # Missed both current and previous window
-        else:
-            return 0
+    - attempts / correct per score band (the game's share right, in
+      SCORE_BANDS bands), for accuracy and the discrimination index
+    - how often each option (and no answer) was chosen
     
-    # Count backwards through consecutive windows
-    for i in range(start_idx, len(all_windows)):
-        window = all_windows[i]
-        if window in user_windows:
-            streak += 1
-        else:
-            break  # Streak broken
+    The discrimination index is the classic upper-lower one: accuracy among
+    the best ~27% of games minus accuracy among the worst ~27%, with the
+    groups cut at score-band boundaries. Near 0 (or negative) means the
+    question doesn't separate strong players from weak ones.
+    """
     
-    return streak
+    WORKSHEET = "Answers"
+    CACHE = 'answers'
+    SCORE_BANDS = 11  # 0%, 10%, ... 100% of the game right
+    GROUP_SHARE = 0.27  # Size of the upper and lower groups
+    
+    def __init__(self):
+        super().__init__()
+        self.reset()
+    
+    def reset(self):
+        """Zero the counts."""
+        self.positions = {}  # Question_ID -> row in the count arrays
+        self.question_ids = []
+        self.attempts = np.zeros((0, self.SCORE_BANDS), dtype=np.int64)
+        self.correct = np.zeros((0, self.SCORE_BANDS), dtype=np.int64)
+        self.options = np.zeros((0, len(ANSWER_OPTIONS)), dtype=np.int64)
+        self.games = np.zeros(self.SCORE_BANDS, dtype=np.int64)  # Games per score band
+    
+    def load(self, rows, full_reload):
+        """Add the rows to the counts (starting from zero on a full reload)."""
+        if full_reload:
+            self.reset()
+        if not rows.empty and 'Question_IDs' in rows.columns:
+            self.update(rows)
+    
+    def update(self, df):
+        """Add a batch of Answers rows to the counts."""
+        question_ids, options, hits, lengths, game_scores = unpack_answers(df)
+        if not len(question_ids):
+            return
+        
+        # Give questions seen for the first time a row of zeros
+        for question_id in pd.unique(question_ids):
+            if question_id not in self.positions:
+                self.positions[question_id] = len(self.question_ids)
+                self.question_ids.append(question_id)
+        grow = len(self.question_ids) - len(self.attempts)
+        if grow:
+            self.attempts = np.vstack([self.attempts, np.zeros((grow, self.SCORE_BANDS), dtype=np.int64)])
+            self.correct = np.vstack([self.correct, np.zeros((grow, self.SCORE_BANDS), dtype=np.int64)])
+            self.options = np.vstack([self.options, np.zeros((grow, len(ANSWER_OPTIONS)), dtype=np.int64)])
+        
+        rows = np.array([self.positions[i] for i in question_ids])
+        game_bands = np.rint(game_scores * (self.SCORE_BANDS - 1)).astype(np.int64)
+        bands = np.repeat(game_bands, lengths)
+        np.add.at(self.attempts, (rows, bands), 1)
+        np.add.at(self.correct, (rows, bands), hits.astype(np.int64))
+        np.add.at(self.options, (rows, options), 1)
+        np.add.at(self.games, game_bands, 1)
+    
+    def table(self):
+        """Return the stats as a DataFrame, one row per question (hardest first)."""
+        with self.lock:
+            attempts, correct, options = self.attempts.copy(), self.correct.copy(), self.options.copy()
+            games, question_ids = self.games.copy(), list(self.question_ids)
+        
+        columns = ['Question_ID', 'Attempts', 'Accuracy', 'Discrimination'] + [
+            f'Pct_{option}' if option != '-' else 'Pct_Blank' for option in ANSWER_OPTIONS
+        ]
+        if not question_ids:
+            return pd.DataFrame(columns=columns)
+        
+        # Upper and lower groups: the fewest bands from each end holding GROUP_SHARE of games
+        n_games = max(games.sum(), 1)
+        from_bottom = np.cumsum(games) / n_games
+        from_top = np.cumsum(games[::-1]) / n_games
+        lower = int(np.searchsorted(from_bottom, self.GROUP_SHARE)) + 1  # Bands [0, lower)
+        upper = self.SCORE_BANDS - 1 - int(np.searchsorted(from_top, self.GROUP_SHARE))  # Bands [upper, end)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total = attempts.sum(axis=1)
+            accuracy = correct.sum(axis=1) / total
+            p_lower = correct[:, :lower].sum(axis=1) / attempts[:, :lower].sum(axis=1)
+            p_upper = correct[:, upper:].sum(axis=1) / attempts[:, upper:].sum(axis=1)
+            spread = options / total[:, None] * 100
+        
+        df = pd.DataFrame(spread.round(1), columns=columns[4:])
+        df.insert(0, 'Question_ID', question_ids)
+        df.insert(1, 'Attempts', total)
+        df.insert(2, 'Accuracy', (accuracy * 100).round(1))
+        df.insert(3, 'Discrimination', (p_upper - p_lower).round(2))
+        return df.sort_values(['Accuracy', 'Attempts'], ascending=[True, False]).reset_index(drop=True)
 
 
-def calculate_all_streaks(df):
-    """
-    Calculate streaks for all users using the window system.
+@st.cache_resource
+def get_question_stats():
+    """Create the process-wide question difficulty stats."""
+    return QuestionStats()
+
+
+def get_live_question_ids(conn, bank):
     """
-    if df.empty:
-        return pd.DataFrame(columns=['Name', 'Current_Streak', 'Last_Played'])
+    Question_IDs of quiz sets that may still be in play.
     
-    # Get unique users
-    users = df['Name'].unique()
-    
-    streaks = []
-    for user in users:
-        streak = calculate_streak(df, user)
-        
-        # Get last played date
-        user_df = df[df['Name'] == user].copy()
-        user_df['Date'] = pd.to_datetime(user_df['Date'], errors='coerce')
-        last_played = user_df['Date'].max()
-        
-        streaks.append({
-            'Name': user,
-            'Current_Streak': streak,
-            'Last_Played': last_played.strftime('%Y-%m-%d') if pd.notna(last_played) else 'N/A'
-        })
+    That is the current window's set, plus the last window's while a quiz
+    started just before the rollover can still be running.
+    """
+    if QUIZ_MODE != "window" or not len(bank):
+        return set()
     
-    streak_df = pd.DataFrame(streaks)
-    streak_df = streak_df.sort_values(by='Current_Streak', ascending=False)
+    now = datetime.now()
+    window_keys = {get_window_key(now), get_window_key(now - timedelta(seconds=TIMER_SECONDS))}
+    n_questions = min(NUM_QUESTIONS, len(bank))
+    live = set()
+    for window_key in window_keys:
+        quiz = get_quiz_set_cache().get(conn, bank, window_key, n_questions)
+        live.update(quiz.questions['Question_ID'])
+    return live
+
+
+def get_question_stats_table(conn):
+    """
+    Question difficulty stats with each question's text, from the shared counts.
     
-    return streak_df.reset_index(drop=True)
+    Questions in a quiz set that is still in play are left out until their
+    window closes, since accuracy next to the option spread gives the answers away.
+    """
+    stats = get_question_stats()
+    refresh_or_serve_stale(stats, conn)  # Also covers a spreadsheet without an Answers sheet yet
+    df = stats.table()
+    
+    bank = get_question_bank_loader().get(conn)
+    df = df[~df['Question_ID'].isin(get_live_question_ids(conn, bank))].reset_index(drop=True)
+    text = {record[0]: record[1] for record in bank.records}
+    df.insert(1, 'Question', df['Question_ID'].map(text).fillna('(no longer in the bank)'))
+    return df
+
+
+def is_editor(token):
+    """Whether a ?token= query param matches the editor token in st.secrets."""
+    try:
+        expected = st.secrets.get(EDITOR_TOKEN_SECRET)
+    except Exception:
+        expected = None  # No secrets file at all
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(str(token).encode('utf-8'), str(expected).encode('utf-8'))
 
 
 # ============================================================================
 # TIMER COMPONENT
 # ============================================================================
-def display_timer():
-    """Display and manage the countdown timer."""
+def get_time_remaining():
+    """Seconds left on the quiz clock, as enforced by the server."""
     if st.session_state.start_time is None:
         return TIMER_SECONDS
     
     elapsed = time.time() - st.session_state.start_time
-    remaining = max(0, TIMER_SECONDS - int(elapsed))
-    
-    # Style based on time remaining
-    timer_class = "timer-container"
-    if remaining <= 10:
-        timer_class += " timer-warning"
-    
-    minutes = remaining // 60
-    seconds = remaining % 60
+    return max(0, TIMER_SECONDS - int(elapsed))
+
+
+def display_timer(auto_submit=False):
+    """
+    Display the countdown timer.
     
-    st.markdown(
-        f'<div class="{timer_class}">{minutes:02d}:{seconds:02d}</div>',
-        unsafe_allow_html=True
-    )
+    The countdown runs in the browser, so the page doesn't rerun every tick.
+    The server still enforces the deadline from start_time. With auto_submit,
+    the browser clicks the Submit button when time runs out.
+    """
+    remaining = get_time_remaining()
+    
+    components.html(f"""
+        <style>
+            body {{ margin: 0; background: transparent; }}
+            .timer-container {{
+                background-color: #000000;
+                color: #ffffff;
+                padding: 1rem 2rem;
+                border-radius: 8px;
+                text-align: center;
+                font-family: 'Inter', 'Helvetica Neue', Helvetica, Arial, sans-serif;
+                font-size: 2rem;
+                font-weight: 700;
+                margin: 0.5rem 0;
+                font-variant-numeric: tabular-nums;
+            }}
+            .timer-warning {{
+                background-color: #333333;
+                animation: pulse 1s infinite;
+            }}
+            @keyframes pulse {{
+                0%, 100% {{ opacity: 1; }}
+                50% {{ opacity: 0.7; }}
+            }}
+        </style>
+        <div id="timer" class="timer-container"></div>
+        <script>
+            const end = Date.now() + {remaining * 1000};
+            const autoSubmit = {'true' if auto_submit else 'false'};
+            const timer = document.getElementById('timer');
+            
+            function tick() {{
+                const left = Math.max(0, Math.ceil((end - Date.now()) / 1000));
+                const minutes = String(Math.floor(left / 60)).padStart(2, '0');
+                const seconds = String(left % 60).padStart(2, '0');
+                timer.innerText = minutes + ':' + seconds;
+                timer.className = left <= 10 ? 'timer-container timer-warning' : 'timer-container';
+                
+                if (left <= 0) {{
+                    clearInterval(interval);
+                    if (autoSubmit) {{
+                        // Time's up: press the Submit button on the page
+                        const buttons = window.parent.document.querySelectorAll('button');
+                        const submit = Array.from(buttons).find(b => b.innerText.includes('Submit Answers'));
+                        if (submit) submit.click();
+                    }}
+                }}
+            }}
+            
+            const interval = setInterval(tick, 250);
+            tick();
+        </script>
+    """, height=100)
     
     return remaining
 
@@ -936,6 +2669,11 @@ def show_welcome_screen():
     st.markdown('<h1 class="main-title">Btown Brief Trivia</h1>', unsafe_allow_html=True)
     st.markdown(f'<p class="subtitle">Test your knowledge in {TIMER_SECONDS} seconds</p>', unsafe_allow_html=True)
     
+    # Warm the question bank while the player types their name
+    conn, error = get_connection()
+    if conn and not error:
+        get_question_bank_loader().prefetch(conn)
+    
     st.markdown("---")
     
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -955,9 +2693,10 @@ def show_welcome_screen():
             if name.strip():
                 st.session_state.player_name = name.strip()
                 st.session_state.game_started = True
-                st.session_state.start_time = time.time()
+                st.session_state.submission_id = new_submission_id()
+                st.session_state.score_saved = False
                 
-                # Fetch questions
+                # Fetch questions (usually already prefetched)
                 conn, error = get_connection()
                 if error:
                     st.session_state.connection_error = error
@@ -967,6 +2706,8 @@ def show_welcome_screen():
                         st.session_state.connection_error = error
                     else:
                         st.session_state.questions = questions
+                        # The clock starts once the questions are in hand
+                        st.session_state.start_time = time.time()
                 
                 st.rerun()
             else:
@@ -1016,31 +2757,27 @@ def show_quiz_screen():
             st.rerun()
         return
     
-    # Timer display (TOP)
-    remaining = display_timer()
-    
-    # Auto-submit if time runs out
+    # Auto-submit if time runs out (checked before any late answers are recorded)
+    remaining = get_time_remaining()
     if remaining <= 0 and not st.session_state.submitted:
         submit_quiz()
         return
     
+    # Timer display (TOP) - presses Submit in the browser when time runs out
+    display_timer(auto_submit=True)
+    
     st.markdown("---")
     
-    # Display questions
-    questions = st.session_state.questions
-    total_questions = len(questions)
+    # Display questions (rendered once per quiz set by build_quiz_payload)
+    payload = st.session_state.quiz_payload
+    if payload is None:
+        payload = st.session_state.quiz_payload = build_quiz_payload(st.session_state.questions)
+    total_questions = len(payload)
     midpoint = total_questions // 2  # Calculate midpoint for middle timer
     
-    for idx, row in questions.iterrows():
-        st.markdown(f'<div class="question-number">Question {idx + 1} of {total_questions}</div>', unsafe_allow_html=True)
-        st.markdown(f'<div class="question-text">{row["Question"]}</div>', unsafe_allow_html=True)
-        
-        options = [
-            f"A) {row['Option_A']}",
-            f"B) {row['Option_B']}",
-            f"C) {row['Option_C']}",
-            f"D) {row['Option_D']}"
-        ]
+    for idx, (number_html, question_html, options) in enumerate(payload):
+        st.markdown(number_html, unsafe_allow_html=True)
+        st.markdown(question_html, unsafe_allow_html=True)
         
         answer = st.radio(
             f"Select answer for Q{idx + 1}",
@@ -1073,15 +2810,15 @@ def show_quiz_screen():
     with col2:
         if st.button("Submit Answers — Wait 5 secs", use_container_width=True):
             submit_quiz()
-    
-    # Auto-refresh for timer (every second)
-    if remaining > 0:
-        time.sleep(0.1)
-        st.rerun()
 
 
+@timed
 def submit_quiz():
     """Calculate score and submit to leaderboard and global history."""
+    # Reruns can land here again after a submission; it has already been queued
+    if st.session_state.submitted:
+        return
+    
     # Calculate time taken
     time_taken = int(time.time() - st.session_state.start_time)
     time_taken = min(time_taken, TIMER_SECONDS)  # Cap at timer limit
@@ -1092,38 +2829,61 @@ def submit_quiz():
     questions = st.session_state.questions
     
     if questions is not None:
-        for idx, row in questions.iterrows():
-            correct = str(row['Correct_Answer']).strip().upper()
-            given = st.session_state.answers.get(idx, '').strip().upper()
-            if given == correct:
-                score += 1
+        given, hits = grade_answers(questions, st.session_state.answers)
+        score = int(hits.sum())
     
     st.session_state.score = score
     
-    # Save to both sheets
-    conn, error = get_connection()
-    if conn and not error:
-        # Save to weekly leaderboard
-        append_to_leaderboard(
-            conn,
-            st.session_state.player_name,
-            score,
-            time_taken
-        )
-        
-        # Save to global history (permanent archive)
-        append_to_global_history(
-            conn,
+    # Queue the score for both sheets (written in the background). Both rows
+    # share this game's Submission_ID, so repeats are dropped instead of stored twice
+    queue = get_submission_queue()
+    if not st.session_state.submission_id:
+        st.session_state.submission_id = new_submission_id()
+    
+    # Save to weekly leaderboard
+    queue.put("Leaderboard", make_leaderboard_entry(
+        st.session_state.player_name,
+        score,
+        time_taken,
+        st.session_state.submission_id
+    ))
+    
+    # Save to global history (permanent archive)
+    queue.put("Global_History", make_history_entry(
+        st.session_state.player_name,
+        score,
+        time_taken,
+        st.session_state.questions_total,
+        st.session_state.submission_id
+    ))
+    
+    # Per-question answers, for the question difficulty stats
+    if LOG_ANSWERS and questions is not None and 'Question_ID' in questions.columns:
+        queue.put("Answers", make_answers_entry(
             st.session_state.player_name,
-            score,
-            time_taken,
-            st.session_state.questions_total
-        )
+            questions,
+            given,
+            hits,
+            st.session_state.submission_id
+        ))
     
     st.session_state.submitted = True
     st.rerun()
 
 
+def show_save_status():
+    """Report the background write of this game's score (polled while pending)."""
+    pending, error = get_submission_queue().status(st.session_state.submission_id)
+    if not pending:
+        # Rerun the whole page once so polling stops and the tables catch up
+        st.session_state.score_saved = True
+        st.rerun()
+    elif error:
+        st.caption(f"⏳ Still saving your score, retrying ({error})")
+    else:
+        st.caption("⏳ Saving your score...")
+
+
 def show_results_screen():
     """Display the results and leaderboard."""
     # Force scroll to top using JavaScript in an iframe
@@ -1138,6 +2898,13 @@ def show_results_screen():
     
     st.markdown('<h1 class="main-title">Quiz Complete!</h1>', unsafe_allow_html=True)
     
+    # The score is written in the background; poll its status without
+    # holding up the rest of the page
+    if st.session_state.score_saved:
+        st.caption("✅ Your score is saved")
+    else:
+        st.fragment(show_save_status, run_every=1)()
+    
     # Score display
     st.markdown(f"""
     <div class="score-display">
@@ -1194,8 +2961,19 @@ def show_results_screen():
     
     st.markdown("---")
     
+    # Player's own career stats
+    st.markdown("### 📊 My Stats")
+    show_my_stats()
+    
+    st.markdown("---")
+    
     # This Quiz's Leaderboard (shown first)
     st.markdown("### 🏅 This Quiz's Leaderboard")
+    conn, error = get_connection()
+    if conn and not error:
+        rank, total = get_leaderboard_rank(conn, st.session_state.score, st.session_state.time_taken)
+        if total:
+            st.markdown(f"You placed **#{rank}** of {total}")
     show_weekly_leaderboard()
     
     st.divider()
@@ -1302,22 +3080,45 @@ def show_results_screen():
     """, unsafe_allow_html=True)
 
 
+def show_my_stats():
+    """Display the player's career profile as stat cards plus recent games."""
+    conn, error = get_connection()
+    profile = get_player_profile(conn, st.session_state.player_name) if conn and not error else None
+    if not profile:
+        st.info("Your career stats will appear here once your score is saved.")
+        return
+    
+    cards = [
+        (f"{profile['accuracy']}%", "Accuracy", f"{profile['games']} games"),
+        (f"{profile['avg_time']}s", "Avg Time", ""),
+        (f"{profile['best_time']}s", "Best Time", ""),
+        (f"🔥 {profile['streak']}", "Streak", "windows in a row")
+    ]
+    for col, (value, label, sublabel) in zip(st.columns(4), cards):
+        with col:
+            st.markdown(f"""
+            <div class="stat-card">
+                <div class="stat-value">{value}</div>
+                <div class="stat-label">{label}</div>
+                <div class="stat-sublabel">{sublabel}</div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    with st.expander("Recent games"):
+        st.dataframe(profile['history'].head(10), use_container_width=True, hide_index=True)
+
+
 def show_weekly_leaderboard():
     """Display the weekly leaderboard."""
     conn, error = get_connection()
     if conn and not error:
-        leaderboard = get_leaderboard(conn)
+        # Display top 10
+        display_df = get_top_leaderboard(conn, 10)
         
-        if not leaderboard.empty:
-            # Display top 10
-            display_df = leaderboard.head(10).copy()
+        if not display_df.empty:
             display_df.index = range(1, len(display_df) + 1)
             display_df.index.name = 'Rank'
             
-            # Format for display
-            if 'Timestamp' in display_df.columns:
-                display_df = display_df[['Name', 'Score', 'Time_Taken']]
-            
             display_df.columns = ['Name', 'Score', 'Time (s)']
             
             st.dataframe(
@@ -1331,6 +3132,7 @@ def show_weekly_leaderboard():
         st.warning("Could not load leaderboard.")
 
 
+@st.fragment
 def show_hall_of_fame_content():
     """Display the Hall of Fame with advanced stats."""
     conn, error = get_connection()
@@ -1339,85 +3141,88 @@ def show_hall_of_fame_content():
         st.warning("Could not load stats. Please try again later.")
         return
     
-    # Get global history
-    history = get_global_history(conn)
-    
-    if history.empty:
+    # Every player appears in the career accuracy table
+    if get_hall_of_fame_table(conn, 'sharpshooter').empty:
         st.info("No historical data yet. Play some games to see stats!")
         return
     
-    # Sub-tabs for different stats
+    # Sub-tabs for different stats. Only the open tab's table is computed, and
+    # switching tabs reruns just this fragment
     stat_tab1, stat_tab2, stat_tab3, stat_tab4 = st.tabs([
         "🎯 Sharpshooters", "⚡ Speed Demons", "📅 Monthly Leaders", "🔥 Streaks"
-    ])
+    ], key="hall_of_fame_tab", on_change="rerun")
     
     with stat_tab1:
         st.markdown("#### 🎯 Sharpshooter Rankings")
         st.markdown("*Highest accuracy across all games*")
         
-        accuracy_df = calculate_sharpshooter(history)
-        
-        if not accuracy_df.empty:
-            display_df = accuracy_df.head(10).copy()
-            display_df.index = range(1, len(display_df) + 1)
-            display_df.index.name = 'Rank'
-            display_df = display_df[['Name', 'Accuracy', 'Total_Correct', 'Total_Questions', 'Games_Played']]
-            display_df.columns = ['Name', 'Accuracy %', 'Correct', 'Total Qs', 'Games']
+        if stat_tab1.open:
+            accuracy_df = get_hall_of_fame_table(conn, 'sharpshooter')
             
-            st.dataframe(display_df, use_container_width=True, hide_index=False)
-        else:
-            st.info("No data available yet.")
+            if not accuracy_df.empty:
+                display_df = accuracy_df.head(10).copy()
+                display_df.index = range(1, len(display_df) + 1)
+                display_df.index.name = 'Rank'
+                display_df = display_df[['Name', 'Accuracy', 'Total_Correct', 'Total_Questions', 'Games_Played']]
+                display_df.columns = ['Name', 'Accuracy %', 'Correct', 'Total Qs', 'Games']
+                
+                st.dataframe(display_df, use_container_width=True, hide_index=False)
+            else:
+                st.info("No data available yet.")
     
     with stat_tab2:
         st.markdown("#### ⚡ Speed Demon Rankings")
         st.markdown("*Fastest average completion time*")
         
-        speed_df = calculate_speed_demon(history)
-        
-        if not speed_df.empty:
-            display_df = speed_df.head(10).copy()
-            display_df.index = range(1, len(display_df) + 1)
-            display_df.index.name = 'Rank'
-            display_df = display_df[['Name', 'Avg_Time', 'Avg_Score', 'Games_Played']]
-            display_df.columns = ['Name', 'Avg Time (s)', 'Avg Score', 'Games']
+        if stat_tab2.open:
+            speed_df = get_hall_of_fame_table(conn, 'speed_demon')
             
-            st.dataframe(display_df, use_container_width=True, hide_index=False)
-        else:
-            st.info("No data available yet.")
+            if not speed_df.empty:
+                display_df = speed_df.head(10).copy()
+                display_df.index = range(1, len(display_df) + 1)
+                display_df.index.name = 'Rank'
+                display_df = display_df[['Name', 'Avg_Time', 'Avg_Score', 'Games_Played']]
+                display_df.columns = ['Name', 'Avg Time (s)', 'Avg Score', 'Games']
+                
+                st.dataframe(display_df, use_container_width=True, hide_index=False)
+            else:
+                st.info("No data available yet.")
     
     with stat_tab3:
         current_month = datetime.now().strftime('%B %Y')
         st.markdown(f"#### 📅 Monthly Leaderboard")
         st.markdown(f"*Top performers for {current_month}*")
         
-        monthly_df = calculate_monthly_leaderboard(history)
-        
-        if not monthly_df.empty:
-            display_df = monthly_df.head(10).copy()
-            display_df.index = range(1, len(display_df) + 1)
-            display_df.index.name = 'Rank'
-            display_df = display_df[['Name', 'Total_Score', 'Avg_Score', 'Games_Played']]
-            display_df.columns = ['Name', 'Total Score', 'Avg Score', 'Games']
+        if stat_tab3.open:
+            monthly_df = get_hall_of_fame_table(conn, 'monthly')
             
-            st.dataframe(display_df, use_container_width=True, hide_index=False)
-        else:
-            st.info(f"No games played in {current_month} yet.")
+            if not monthly_df.empty:
+                display_df = monthly_df.head(10).copy()
+                display_df.index = range(1, len(display_df) + 1)
+                display_df.index.name = 'Rank'
+                display_df = display_df[['Name', 'Total_Score', 'Avg_Score', 'Games_Played']]
+                display_df.columns = ['Name', 'Total Score', 'Avg Score', 'Games']
+                
+                st.dataframe(display_df, use_container_width=True, hide_index=False)
+            else:
+                st.info(f"No games played in {current_month} yet.")
     
     with stat_tab4:
         st.markdown("#### 🔥 Streak Leaders")
-        st.markdown("*Consecutive windows played (Mon-Thu & Fri-Sun)*")
+        st.markdown(f"*Consecutive windows played ({describe_play_windows()})*")
         
-        streak_df = calculate_all_streaks(history)
-        
-        if not streak_df.empty:
-            display_df = streak_df.head(10).copy()
-            display_df.index = range(1, len(display_df) + 1)
-            display_df.index.name = 'Rank'
-            display_df.columns = ['Name', 'Current Streak', 'Last Played']
+        if stat_tab4.open:
+            streak_df = get_hall_of_fame_table(conn, 'all_streaks')
             
-            st.dataframe(display_df, use_container_width=True, hide_index=False)
-        else:
-            st.info("No streak data available yet.")
+            if not streak_df.empty:
+                display_df = streak_df.head(10).copy()
+                display_df.index = range(1, len(display_df) + 1)
+                display_df.index.name = 'Rank'
+                display_df.columns = ['Name', 'Current Streak', 'Last Played']
+                
+                st.dataframe(display_df, use_container_width=True, hide_index=False)
+            else:
+                st.info("No streak data available yet.")
 
 
 def show_hall_of_fame_standalone():
@@ -1438,6 +3243,37 @@ def show_hall_of_fame_standalone():
             st.rerun()
 
 
+def show_question_stats_screen():
+    """Question difficulty stats for editors (?view=questions&token=..., see is_editor())."""
+    st.markdown('<h1 class="main-title">📋 Question Stats</h1>', unsafe_allow_html=True)
+    st.markdown('<p class="subtitle">How each question has played, hardest first</p>', unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    conn, error = get_connection()
+    if error:
+        st.error(f"Could not connect: {error}")
+        return
+    
+    try:
+        df = get_question_stats_table(conn)
+    except Exception as e:
+        st.error(f"Could not load question stats: {e}")
+        return
+    if df.empty:
+        st.info("No answers recorded for past quizzes yet.")
+        return
+    
+    st.caption(
+        "Questions in the quiz that is live right now are hidden until its window closes. "
+        "**Accuracy**: % of players who got it right. "
+        "**Discrimination**: accuracy among the top ~27% of games minus the bottom ~27%; "
+        "near zero or negative means the question doesn't reward knowing more. "
+        "**Pct_A-D / Blank**: how often each option was chosen."
+    )
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+
 # ============================================================================
 # MAIN APP
 # ============================================================================
@@ -1445,15 +3281,23 @@ def main():
     """Main application entry point."""
     init_session_state()
     
+    # Editors-only question stats; without a valid token the normal app is shown
+    if st.query_params.get('view') == 'questions' and is_editor(st.query_params.get('token')):
+        screen, show_screen = 'question_stats', show_question_stats_screen
     # Check if showing Hall of Fame standalone
-    if st.session_state.get('show_hall_of_fame', False):
-        show_hall_of_fame_standalone()
+    elif st.session_state.get('show_hall_of_fame', False):
+        screen, show_screen = 'hall_of_fame', show_hall_of_fame_standalone
     elif not st.session_state.game_started:
-        show_welcome_screen()
+        screen, show_screen = 'welcome', show_welcome_screen
     elif st.session_state.submitted:
-        show_results_screen()
+        screen, show_screen = 'results', show_results_screen
     else:
-        show_quiz_screen()
+        screen, show_screen = 'quiz', show_quiz_screen
+    
+    # Time the whole rerun, per screen
+    get_metrics().inc('script_runs_total', screen=screen)
+    with get_metrics().timer('script_run_seconds', screen=screen):
+        show_screen()
 
 
 if __name__ == "__main__":
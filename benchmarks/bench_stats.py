@@ -0,0 +1,238 @@
+"""
+Benchmark the stats functions on synthetic Global_History frames.
+
+Measures wall time (median of several runs) and peak memory (tracemalloc)
+for the Hall of Fame calculations, the Leaderboard sort, ranking and
+rotation, and the history normalization, at history sizes from 1k to 1M rows.
+
+Usage:
+    python benchmarks/bench_stats.py                     # default scales
+    python benchmarks/bench_stats.py --scales small,medium
+    python benchmarks/bench_stats.py --json results.json
+    python benchmarks/bench_stats.py --baseline results.json --tolerance 0.25
+
+With --baseline, the run fails (exit code 1) if any function got slower
+than the baseline by more than the tolerance.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import reference_stats
+from synthetic_history import generate_history, generate_leaderboard
+
+# name -> (rows, players)
+SCALES = {
+    'small': (1_000, 10),
+    'medium': (10_000, 500),
+    'large': (100_000, 5_000),
+    'xlarge': (1_000_000, 50_000),
+}
+DEFAULT_SCALES = 'small,medium,large'
+# The reference calculate_all_streaks loops over players, rescanning the
+# history for each (players x rows); beyond this many players it is skipped
+REFERENCE_STREAKS_MAX_PLAYERS = 5_000
+
+
+def import_app():
+    """Import app.py outside `streamlit run`, silencing bare-mode chatter."""
+    import streamlit  # noqa: F401 - registers Streamlit's loggers
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith('streamlit'):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        import app
+    return app
+
+
+class FrameStorage:
+    """Storage stand-in that serves fixed frames (no I/O)."""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def read(self, worksheet, ttl=None, **options):
+        return self.frames[worksheet]
+
+    def read_since(self, worksheet, watermark):
+        df = self.frames[worksheet]
+        return df.iloc[watermark:], len(df)
+
+    def read_first(self, worksheet, n_rows):
+        return self.frames[worksheet].iloc[:n_rows]
+
+    def delete_first_rows(self, worksheet, n_rows):
+        self.frames[worksheet] = self.frames[worksheet].iloc[n_rows:]
+
+
+def current_window_leaderboard(app, leaderboard):
+    """Copy of a leaderboard with every row played in the current window (nothing to rotate)."""
+    leaderboard = leaderboard.copy()
+    now = datetime.now()
+    leaderboard['Window'] = app.get_window_key(now)
+    leaderboard['Timestamp'] = now.strftime('%Y-%m-%d %H:%M:%S')
+    return leaderboard
+
+
+def sort_leaderboard(app, storage):
+    """
+    Full read and sort of the current window's Leaderboard: how the app built
+    it before LeaderboardRanking, kept as the reference for that case.
+    """
+    df = storage.read("Leaderboard", ttl=1)
+    df = app.drop_duplicate_submissions(df.dropna(how='all'))
+    df = df[app.in_current_window(df)]
+    return df.sort_values(by=['Score', 'Time_Taken'], ascending=[False, True]).reset_index(drop=True)
+
+
+def get_cases(app, history, leaderboard):
+    """Benchmarked callables. Each gets a fresh copy since some mutate their input."""
+    # The ranking cases read a leaderboard of the current window only; the
+    # rotation case adds the synthetic (past) rows in front, to be deleted
+    current = current_window_leaderboard(app, leaderboard)
+    storage = FrameStorage({'Leaderboard': current})
+    rotating = pd.concat([leaderboard, current], ignore_index=True)
+    top_player = history['Name'].value_counts().index[0]
+
+    def materialized_tables(df):
+        aggregates = app.HallOfFameAggregates()
+        aggregates.update(df)
+        for table in ('sharpshooter', 'speed_demon', 'monthly', 'all_streaks'):
+            getattr(aggregates, table)()
+
+    def leaderboard_ranking(df):
+        ranking = app.LeaderboardRanking()
+        ranking.refresh(storage)
+        ranking.top(10)
+        ranking.rank(5, 60)
+
+    def leaderboard_rotation(df):
+        ranking = app.LeaderboardRanking()
+        ranking.refresh(FrameStorage({'Leaderboard': rotating}))
+
+    cases = {
+        'calculate_sharpshooter': lambda df: reference_stats.calculate_sharpshooter(df),
+        'calculate_speed_demon': lambda df: reference_stats.calculate_speed_demon(df),
+        'calculate_monthly_leaderboard': lambda df: reference_stats.calculate_monthly_leaderboard(df),
+        'calculate_streak': lambda df: reference_stats.calculate_streak(df, top_player),
+        'calculate_all_streaks': lambda df: reference_stats.calculate_all_streaks(df),
+        'sort_leaderboard': lambda df: sort_leaderboard(app, storage),
+        'leaderboard_ranking': leaderboard_ranking,
+        'leaderboard_rotation': leaderboard_rotation,
+        'normalize_history': lambda df: app.normalize_history(df),
+        'materialized_tables': materialized_tables,
+    }
+    if history['Name'].nunique() > REFERENCE_STREAKS_MAX_PLAYERS:
+        del cases['calculate_all_streaks']
+    return cases
+
+
+def measure(func, history, repeats):
+    """Return (median seconds, peak bytes) for func(history copy)."""
+    timings = []
+    for _ in range(repeats):
+        df = history.copy()
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+
+    # Separate run for memory: tracemalloc slows everything down
+    df = history.copy()
+    tracemalloc.start()
+    func(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(timings), peak
+
+
+def run(scales, repeats, seed):
+    app = import_app()
+    results = []
+
+    for scale in scales:
+        n_rows, n_players = SCALES[scale]
+        history = generate_history(n_rows, n_players, seed=seed)
+        leaderboard = generate_leaderboard(history)
+
+        # Fewer repeats for the biggest frames
+        scale_repeats = max(1, repeats // 5) if n_rows >= 1_000_000 else repeats
+
+        for name, func in get_cases(app, history, leaderboard).items():
+            seconds, peak = measure(func, history, scale_repeats)
+            results.append({
+                'scale': scale,
+                'rows': n_rows,
+                'players': n_players,
+                'function': name,
+                'seconds': seconds,
+                'peak_bytes': peak,
+            })
+            print(f"{scale:>7} {n_rows:>9,} rows {n_players:>6,} players  "
+                  f"{name:<30} {seconds * 1000:>10.1f} ms {peak / 2 ** 20:>9.1f} MiB", flush=True)
+
+    return results
+
+
+def find_regressions(results, baseline, tolerance):
+    """Return descriptions of results slower than baseline * (1 + tolerance)."""
+    previous = {(r['scale'], r['function']): r['seconds'] for r in baseline}
+    regressions = []
+    for r in results:
+        before = previous.get((r['scale'], r['function']))
+        if before and r['seconds'] > before * (1 + tolerance):
+            regressions.append(
+                f"{r['scale']} {r['function']}: {before * 1000:.1f} ms -> {r['seconds'] * 1000:.1f} ms"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default=DEFAULT_SCALES,
+                        help=f"comma-separated subset of {', '.join(SCALES)} (default: {DEFAULT_SCALES})")
+    parser.add_argument('--repeats', type=int, default=5, help="timed runs per function (median is reported)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the synthetic history")
+    parser.add_argument('--json', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="JSON results from a previous run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown vs baseline before failing (default: 0.25 = 25%%)")
+    args = parser.parse_args()
+
+    scales = [scale.strip() for scale in args.scales.split(',') if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(unknown)}")
+
+    results = run(scales, args.repeats, args.seed)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
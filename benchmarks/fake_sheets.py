@@ -0,0 +1,136 @@
+"""
+In-process stand-in for the Google Sheets connection.
+
+FakeSheetsConnection implements the parts of GSheetsConnection that app.py
+uses (read / update and the gspread worksheet behind client._select_worksheet)
+on top of in-memory lists, with a configurable per-call latency so load tests
+can model the real API without touching Google.
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+
+
+class FakeWorksheet:
+    """In-memory worksheet: a list of rows, the first being the header."""
+
+    def __init__(self, connection, title, rows=None):
+        self.connection = connection
+        self.title = title
+        self.rows = rows or []
+
+    def row_values(self, row):
+        self.connection.api_call('row_values')
+        with self.connection.lock:
+            return list(self.rows[row - 1]) if len(self.rows) >= row else []
+
+    def update(self, range_name, values=None, **kwargs):
+        """Only the header update done by app.py ('A1', [header]) is supported."""
+        self.connection.api_call('update')
+        with self.connection.lock:
+            if self.rows:
+                self.rows[0] = list(values[0])
+            else:
+                self.rows.append(list(values[0]))
+
+    def append_rows(self, values, **kwargs):
+        self.connection.api_call('append_rows')
+        with self.connection.lock:
+            self.rows.extend([list(row) for row in values])
+
+    def delete_rows(self, start_index, end_index=None):
+        self.connection.api_call('delete_rows')
+        with self.connection.lock:
+            del self.rows[start_index - 1:(end_index or start_index)]
+
+    def col_values(self, col):
+        self.connection.api_call('col_values')
+        with self.connection.lock:
+            return [str(row[col - 1]) if len(row) >= col else '' for row in self.rows]
+
+    def batch_get(self, ranges, **kwargs):
+        """Supports the '1:1' header range and 'A<n>:ZZ' / 'A<n>:ZZ<m>' row ranges."""
+        self.connection.api_call('batch_get')
+        result = []
+        with self.connection.lock:
+            for range_name in ranges:
+                if range_name == '1:1':
+                    result.append(self.rows[:1])
+                else:
+                    start, end = range_name.split(':')
+                    last_row = int(end[2:]) if end[2:] else None
+                    rows = self.rows[int(start[1:]) - 1:last_row]
+                    result.append([[str(value) for value in row] for row in rows])
+        return result
+
+
+class FakeClient:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def _select_worksheet(self, worksheet=None, **kwargs):
+        self.connection.api_call('select_worksheet')
+        return self.connection.worksheet(worksheet)
+
+
+class FakeSheetsConnection:
+    """
+    Thread-safe fake of GSheetsConnection.
+
+    latency: mean seconds added to every API call
+    jitter: +/- fraction of latency applied at random
+    """
+
+    def __init__(self, latency=0.0, jitter=0.5):
+        self.latency = latency
+        self.jitter = jitter
+        self.lock = threading.Lock()
+        self.worksheets = {}
+        self.calls = Counter()
+        self.client = FakeClient(self)
+
+    def api_call(self, kind):
+        with self.lock:
+            self.calls[kind] += 1
+        if self.latency:
+            time.sleep(self.latency * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def worksheet(self, title):
+        with self.lock:
+            if title not in self.worksheets:
+                self.worksheets[title] = FakeWorksheet(self, title)
+            return self.worksheets[title]
+
+    def load(self, title, df):
+        """Seed a worksheet from a DataFrame (no latency, not counted)."""
+        rows = [list(df.columns)] + df.astype(object).where(df.notna(), '').values.tolist()
+        with self.lock:
+            self.worksheets[title] = FakeWorksheet(self, title, rows)
+
+    def frame(self, title):
+        """Current worksheet contents as a DataFrame (no latency, not counted)."""
+        with self.lock:
+            rows = list(self.worksheet_rows(title))
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows[1:], columns=rows[0])
+
+    def worksheet_rows(self, title):
+        sheet = self.worksheets.get(title)
+        return sheet.rows if sheet else []
+
+    def read(self, worksheet=None, ttl=None, usecols=None, **options):
+        self.api_call('read')
+        df = self.frame(worksheet)
+        if usecols is not None and not df.empty:
+            df = df.iloc[:, list(usecols)]
+        return df
+
+    def update(self, worksheet=None, data=None, **kwargs):
+        self.api_call('update')
+        self.load(worksheet, data)
+        return data
@@ -0,0 +1,317 @@
+"""
+Load test for app.py.
+
+Two kinds of players run at once against one in-process fake of the Sheets
+connection with configurable latency (see fake_sheets.py):
+
+- Games: --concurrency threads play --games games through the app's
+  process-wide server paths, as concurrent sessions would: question bank
+  and quiz set, the write-behind SubmissionQueue, then the results screen's
+  leaderboard, rank, Hall of Fame tables and player profile. This is what
+  measures the app's capacity.
+- Sessions: --sessions players click through the real script with
+  Streamlit's AppTest: welcome -> Start Quiz -> answer every question ->
+  Submit -> results. AppTest is not thread-safe, so these run one after
+  another; they check the UI end to end and time its reruns under the load
+  of the games.
+
+Reports throughput, p50/p99 latency per step, Sheets API call counts and,
+once the write queues have drained, lost or duplicated submissions. Errors
+raised by app code fail the run; errors of the AppTest harness itself are
+reported separately and don't.
+
+The app runs from a temporary copy of its directory, so files it writes
+next to app.py (the history snapshot) don't land in the working tree.
+
+Usage:
+    python benchmarks/load_test.py --games 500 --concurrency 20 --latency 0.3
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+import bench_stats
+from fake_sheets import FakeSheetsConnection
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HALL_OF_FAME_TABLES = ('sharpshooter', 'speed_demon', 'monthly', 'all_streaks')
+
+
+class AppError(Exception):
+    """An exception raised by app code (as opposed to the test harness)."""
+
+
+def quiet_streamlit():
+    """Hide bare-mode and deprecation warnings; they'd drown the report."""
+    logging.disable(logging.WARNING)
+
+
+def stage_app(directory):
+    """Copy app.py into directory (static/ linked alongside) and return its path."""
+    app_path = os.path.join(directory, 'app.py')
+    shutil.copy(os.path.join(ROOT, 'app.py'), app_path)
+    try:
+        os.symlink(os.path.join(ROOT, 'static'), os.path.join(directory, 'static'))
+    except OSError:
+        shutil.copytree(os.path.join(ROOT, 'static'), os.path.join(directory, 'static'))
+    return app_path
+
+
+def make_questions(n_questions):
+    """Question bank where option A is always correct."""
+    return pd.DataFrame({
+        'Question': [f"Load test question {i}?" for i in range(n_questions)],
+        'Option_A': [f"Right {i}" for i in range(n_questions)],
+        'Option_B': [f"Wrong {i}" for i in range(n_questions)],
+        'Option_C': [f"Also wrong {i}" for i in range(n_questions)],
+        'Option_D': [f"Nope {i}" for i in range(n_questions)],
+        'Correct_Answer': 'A',
+    })
+
+
+def find_button(at, prefix):
+    return next(button for button in at.button if button.label.startswith(prefix))
+
+
+def play_session(app_path, index, timeout, timings):
+    """Play one full game through the script. Appends (step, seconds) to timings; returns the player name."""
+    name = f"Load Player {index:05d}"
+
+    def timed(step, action):
+        start = time.perf_counter()
+        at = action()
+        timings.append((step, time.perf_counter() - start))
+        if at.exception:
+            raise AppError(f"{step}: {at.exception[0].message}")
+        return at
+
+    at = timed('welcome', lambda: AppTest.from_file(app_path, default_timeout=timeout).run())
+
+    at.text_input(key='name_input').input(name)
+    at = timed('start', lambda: find_button(at, 'Start Quiz').click().run())
+
+    # One rerun per answer, like clicking radios in the browser
+    for radio in list(at.radio):
+        at = timed('answer', lambda: radio.set_value(radio.options[0]).run())
+
+    at = timed('submit', lambda: find_button(at, 'Submit Answers').click().run())
+    return name
+
+
+def play_game(app, index, timings):
+    """
+    Play one game through the server paths a session uses. Appends
+    (step, seconds) to timings; returns the player name.
+    """
+    name = f"Load Game {index:05d}"
+
+    def timed(step, action):
+        start = time.perf_counter()
+        result = action()
+        timings.append((step, time.perf_counter() - start))
+        return result
+
+    storage, error = app.get_connection()
+    if error:
+        raise AppError(error)
+
+    def start():
+        bank = app.get_question_bank_loader().get(storage)
+        n_questions = min(app.NUM_QUESTIONS, len(bank))
+        if app.QUIZ_MODE == "window":
+            window_key = app.get_window_key(datetime.now())
+            return app.get_quiz_set_cache().get(storage, bank, window_key, n_questions).questions
+        return bank.sample(n_questions)
+
+    questions = timed('start', start)
+
+    def submit():
+        given, hits = app.grade_answers(questions, {idx: 'A' for idx in questions.index})
+        score, time_taken = int(hits.sum()), index % app.TIMER_SECONDS
+        submission_id = app.new_submission_id()
+        queue = app.get_submission_queue()
+        queue.put("Leaderboard", app.make_leaderboard_entry(name, score, time_taken, submission_id))
+        queue.put("Global_History", app.make_history_entry(name, score, time_taken, len(questions), submission_id))
+        queue.put("Answers", app.make_answers_entry(name, questions, given, hits, submission_id))
+        return score, time_taken
+
+    score, time_taken = timed('submit', submit)
+
+    def results():
+        app.get_top_leaderboard(storage)
+        app.get_leaderboard_rank(storage, score, time_taken)
+        for table in HALL_OF_FAME_TABLES:
+            app.get_hall_of_fame_table(storage, table)
+        app.get_player_profile(storage, name)
+
+    timed('results', results)
+    return name
+
+
+def percentile(values, pct):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def latency_report(timings):
+    """p50/p99 per step (and over all steps) from (step, seconds) pairs."""
+    by_step = defaultdict(list)
+    for step, seconds in timings:
+        by_step[step].append(seconds)
+    all_steps = [seconds for _, seconds in timings]
+    return {
+        step: {
+            'count': len(values),
+            'p50': percentile(values, 50),
+            'p99': percentile(values, 99),
+        }
+        for step, values in [('all', all_steps)] + sorted(by_step.items())
+    }
+
+
+def wait_for_rows(fake, worksheet, expected, timeout):
+    """Wait until the write-behind queues have flushed `expected` rows."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if len(fake.frame(worksheet)) >= expected:
+            return
+        time.sleep(0.25)
+
+
+def count_submissions(fake, worksheet, names):
+    """Return (lost, duplicated) submissions for the given player names."""
+    df = fake.frame(worksheet)
+    counts = Counter(df['Name']) if not df.empty else Counter()
+    lost = sum(1 for name in names if counts[name] == 0)
+    duplicated = sum(counts[name] - 1 for name in names if counts[name] > 1)
+    return lost, duplicated
+
+
+def run(args, app_path):
+    fake = FakeSheetsConnection(latency=args.latency, jitter=args.jitter)
+    fake.load('Questions', make_questions(args.questions))
+    streamlit.connection = lambda *a, **k: fake
+
+    # The games drive the staged copy as a module; the sessions run it as a script
+    sys.path.insert(0, os.path.dirname(app_path))
+    app = bench_stats.import_app()
+
+    game_timings, session_timings = [], []
+    names = []
+    app_errors, harness_errors = [], []
+
+    def run_game(index):
+        try:
+            names.append(play_game(app, index, game_timings))
+        except Exception as e:
+            app_errors.append(f"game {index}: {e!r}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        games = pool.map(run_game, range(args.games))
+
+        for index in range(args.sessions):
+            try:
+                names.append(play_session(app_path, index, args.timeout, session_timings))
+            except AppError as e:
+                app_errors.append(f"session {index}: {e}")
+            except Exception as e:
+                harness_errors.append(f"session {index}: {e!r}")
+
+        list(games)
+        games_elapsed = time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+
+    wait_for_rows(fake, 'Global_History', len(names), args.drain_timeout)
+    wait_for_rows(fake, 'Leaderboard', len(names), args.drain_timeout)
+
+    games_completed = sum(1 for name in names if name.startswith('Load Game'))
+    report = {
+        'games': args.games,
+        'games_completed': games_completed,
+        'sessions': args.sessions,
+        'sessions_completed': len(names) - games_completed,
+        'app_errors': len(app_errors),
+        'harness_errors': len(harness_errors),
+        'concurrency': args.concurrency,
+        'latency': args.latency,
+        'elapsed_seconds': elapsed,
+        'games_per_second': games_completed / games_elapsed if games_elapsed else 0,
+        'game_steps': latency_report(game_timings),
+        'session_reruns': latency_report(session_timings),
+        'api_calls': dict(fake.calls),
+        'submissions': {},
+        'errors': (app_errors + harness_errors)[:20],
+    }
+    for worksheet in ('Leaderboard', 'Global_History'):
+        lost, duplicated = count_submissions(fake, worksheet, names)
+        report['submissions'][worksheet] = {'lost': lost, 'duplicated': duplicated}
+    return report
+
+
+def print_report(report):
+    print(f"Games: {report['games_completed']}/{report['games']} completed "
+          f"({report['concurrency']} concurrent, {report['latency'] * 1000:.0f} ms API latency), "
+          f"{report['games_per_second']:.2f} games/s")
+    print(f"Sessions: {report['sessions_completed']}/{report['sessions']} completed "
+          f"over {report['elapsed_seconds']:.1f} s")
+    print(f"Errors: {report['app_errors']} app, {report['harness_errors']} harness")
+    for title, key in (("Game step latency:", 'game_steps'), ("Session rerun latency:", 'session_reruns')):
+        print(title)
+        for step, stats in report[key].items():
+            print(f"  {step:<8} n={stats['count']:<6} p50={stats['p50'] * 1000:8.1f} ms  p99={stats['p99'] * 1000:8.1f} ms")
+    print("Sheets API calls: " + ", ".join(f"{kind}={count}" for kind, count in sorted(report['api_calls'].items())))
+    for worksheet, counts in report['submissions'].items():
+        print(f"{worksheet}: {counts['lost']} lost, {counts['duplicated']} duplicated")
+    for error in report['errors']:
+        print(f"  {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=200, help="games played concurrently through the server paths")
+    parser.add_argument('--concurrency', type=int, default=10, help="games in flight at once")
+    parser.add_argument('--sessions', type=int, default=5, help="players clicking through the script with AppTest")
+    parser.add_argument('--latency', type=float, default=0.2, help="mean seconds per fake Sheets API call")
+    parser.add_argument('--jitter', type=float, default=0.5, help="+/- latency fraction applied at random")
+    parser.add_argument('--questions', type=int, default=100, help="size of the fake question bank")
+    parser.add_argument('--timeout', type=float, default=120, help="seconds allowed per script run")
+    parser.add_argument('--drain-timeout', type=float, default=60,
+                        help="seconds to wait for queued writes to reach the sheets")
+    parser.add_argument('--json', help="write the report to this JSON file")
+    args = parser.parse_args()
+
+    quiet_streamlit()
+    with tempfile.TemporaryDirectory(prefix='trivia-load-') as directory:
+        report = run(args, stage_app(directory))
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    # Harness errors are reported but don't fail the run
+    lost_or_duplicated = any(counts['lost'] or counts['duplicated'] for counts in report['submissions'].values())
+    # Streamlit's background threads (write queue, etc.) are daemons
+    sys.exit(1 if report['app_errors'] or lost_or_duplicated else 0)
+
+
+if __name__ == "__main__":
+    main()
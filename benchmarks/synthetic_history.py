@@ -0,0 +1,84 @@
+"""
+Synthetic Global_History generator for benchmarks.
+
+Produces frames shaped like the Global_History sheet: a skewed player
+population (a few regulars, a long tail of occasional players), play dates
+clustered on quiz release days, and the dirty values real sheets contain
+(missing Questions_Total on old rows, scores stored as strings, blank and
+garbage cells).
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Share of rows affected by each kind of dirty value
+MISSING_QUESTIONS_TOTAL = 0.10
+STRING_SCORES = 0.05
+GARBAGE_SCORES = 0.01
+MISSING_TIMES = 0.02
+MISSING_DATES = 0.01
+
+
+def generate_history(n_rows, n_players, days=365, seed=0, end=None):
+    """
+    Generate a synthetic Global_History frame.
+    
+    n_rows: number of submissions
+    n_players: size of the player population
+    days: how far back the history goes
+    seed: random seed, so runs are reproducible
+    end: last day of history (defaults to today)
+    """
+    rng = np.random.default_rng(seed)
+    end = end or datetime.now()
+    
+    # Zipf-like activity: player k plays roughly 1/k as often as player 1
+    weights = 1.0 / np.arange(1, n_players + 1)
+    players = rng.choice(n_players, size=n_rows, p=weights / weights.sum())
+    names = np.array([f"Player {i:05d}" for i in range(n_players)], dtype=object)[players]
+    
+    # Most plays land on release days (Monday / Friday) or the day after
+    offsets = rng.integers(0, days, size=n_rows)
+    dates = pd.to_datetime(end.date()) - pd.to_timedelta(offsets, unit='D')
+    release_day = np.where(dates.weekday <= 3, 0, 4)
+    snap = rng.random(n_rows) < 0.7
+    shift = np.where(snap, dates.weekday - release_day - rng.integers(0, 2, size=n_rows), 0)
+    dates = dates - pd.to_timedelta(np.clip(shift, 0, None), unit='D')
+    seconds = pd.to_timedelta(rng.integers(6 * 3600, 23 * 3600, size=n_rows), unit='s')
+    timestamps = dates + seconds
+    
+    questions_total = rng.choice([5, 10], size=n_rows, p=[0.8, 0.2]).astype(float)
+    scores = rng.binomial(questions_total.astype(int), 0.6).astype(object)
+    times = rng.integers(8, 61, size=n_rows).astype(float)
+    
+    df = pd.DataFrame({
+        'Name': names,
+        'Score': scores,
+        'Time_Taken': times,
+        'Questions_Total': questions_total,
+        'Timestamp': timestamps.strftime('%Y-%m-%d %H:%M:%S'),
+        'Date': dates.strftime('%Y-%m-%d')
+    })
+    
+    # Dirty values
+    df.loc[rng.random(n_rows) < MISSING_QUESTIONS_TOTAL, 'Questions_Total'] = np.nan
+    as_string = rng.random(n_rows) < STRING_SCORES
+    df.loc[as_string, 'Score'] = df.loc[as_string, 'Score'].astype(str)
+    df.loc[rng.random(n_rows) < GARBAGE_SCORES, 'Score'] = 'n/a'
+    df.loc[rng.random(n_rows) < MISSING_TIMES, 'Time_Taken'] = np.nan
+    df.loc[rng.random(n_rows) < MISSING_DATES, 'Date'] = np.nan
+    
+    return df.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+
+
+def generate_leaderboard(history):
+    """Leaderboard-shaped frame (Name, Score, Time_Taken, Timestamp) from a history frame."""
+    leaderboard = history[['Name', 'Score', 'Time_Taken', 'Timestamp']].copy()
+    leaderboard['Score'] = pd.to_numeric(leaderboard['Score'], errors='coerce')
+    return leaderboard
+
+
+if __name__ == "__main__":
+    print(generate_history(20, 5).to_string())
@@ -0,0 +1,155 @@
+"""
+Build the responsive background image variants served by app.py.
+
+Reads background.jpeg and writes, under static/:
+    background/background-<width>.<hash>.avif|webp|jpg   resized variants
+    background.css                                       rules that pick a variant
+
+The CSS paints a tiny blurred placeholder (inlined once, as a data URI in a
+custom property) at once, then layers the best variant for the viewport on
+top of it: AVIF or WebP through image-set(), with a JPEG fallback for older
+browsers. A variant that doesn't come out smaller than the source file is
+not written; a width left without a JPEG falls back to the next narrower one.
+
+File names carry a content hash, so a variant never changes once
+published. Streamlit's static serving sends an ETag and Last-Modified but
+no max-age; to get long-lived caching, have a CDN or reverse proxy send
+"Cache-Control: public, max-age=31536000, immutable" for /app/static/background/.
+
+Run after replacing background.jpeg, and commit the output:
+    python scripts/build_background.py
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import os
+
+from PIL import Image, ImageFilter, features
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, 'background.jpeg')
+STATIC_DIR = os.path.join(ROOT, 'static')
+VARIANT_DIR = 'background'  # Under STATIC_DIR
+
+WIDTHS = (640, 1024, 1600, 2000)
+# Extension -> (Pillow format, MIME type, save options), best first
+FORMATS = {
+    'avif': ('AVIF', 'image/avif', {'quality': 50}),
+    'webp': ('WEBP', 'image/webp', {'quality': 72, 'method': 6}),
+    'jpg': ('JPEG', 'image/jpeg', {'quality': 70, 'optimize': True, 'progressive': True}),
+}
+PLACEHOLDER_WIDTH = 24
+
+
+def encode(image, fmt, options):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def resize(image, width):
+    height = round(image.height * width / image.width)
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def build_variants(image, widths, formats, max_bytes):
+    """
+    Write every (width, format) variant smaller than max_bytes.
+    Returns {width: [(url, mime), ...]}.
+    """
+    out_dir = os.path.join(STATIC_DIR, VARIANT_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Drop variants from earlier builds
+    for name in os.listdir(out_dir):
+        if name.startswith('background-'):
+            os.remove(os.path.join(out_dir, name))
+
+    variants = {}
+    for width in widths:
+        resized = resize(image, width) if width < image.width else image
+        for ext, (fmt, mime, options) in formats.items():
+            data = encode(resized, fmt, options)
+            if len(data) >= max_bytes:
+                print(f"{f'background-{width}.{ext}':<40} {len(data) / 1024:7.1f} KiB  skipped, not smaller than the source")
+                continue
+            digest = hashlib.sha1(data).hexdigest()[:10]
+            name = f'background-{width}.{digest}.{ext}'
+            with open(os.path.join(out_dir, name), 'wb') as f:
+                f.write(data)
+            variants.setdefault(width, []).append((f'{VARIANT_DIR}/{name}', mime))
+            print(f"{name:<40} {len(data) / 1024:7.1f} KiB")
+    return variants
+
+
+def build_placeholder(image):
+    """A tiny blurred JPEG, as a data URI."""
+    small = resize(image, PLACEHOLDER_WIDTH).filter(ImageFilter.GaussianBlur(1))
+    data = encode(small, 'JPEG', {'quality': 40})
+    print(f"{'placeholder (inline)':<40} {len(data) / 1024:7.1f} KiB")
+    return 'data:image/jpeg;base64,' + base64.b64encode(data).decode()
+
+
+def build_css(variants, placeholder):
+    """Background rules: placeholder underneath, the right variant on top."""
+    selector = '.stApp, [data-testid="stAppViewContainer"]'
+
+    # JPEG fallback per width: its own, else the next narrower one
+    widths = sorted(variants)
+    fallbacks = {}
+    fallback = None
+    for width in widths:
+        fallback = next((url for url, mime in variants[width] if mime == 'image/jpeg'), fallback)
+        fallbacks[width] = fallback
+    if fallbacks[widths[0]] is None:
+        raise SystemExit("No JPEG variant is smaller than the source; there is nothing to fall back to")
+
+    def rules(width, indent=''):
+        sources = list(variants[width])
+        if (fallbacks[width], 'image/jpeg') not in sources:
+            sources.append((fallbacks[width], 'image/jpeg'))
+        image_set = ', '.join(f'url("{url}") type("{mime}")' for url, mime in sources)
+        return (
+            f'{indent}{selector} {{\n'
+            f'{indent}    background-image: url("{fallbacks[width]}"), var(--background-placeholder);\n'
+            f'{indent}    background-image: image-set({image_set}), var(--background-placeholder);\n'
+            f'{indent}}}\n'
+        )
+
+    css = [
+        '/* Generated by scripts/build_background.py - do not edit */\n'
+        '/* Sizing and positioning live in theme.css */\n\n',
+        f':root {{\n    --background-placeholder: url("{placeholder}");\n}}\n\n',
+        rules(widths[-1]),
+    ]
+    # Narrower viewports get narrower images (later rules win)
+    for width in reversed(widths[:-1]):
+        css.append(f'\n@media (max-width: {width}px) {{\n{rules(width, "    ")}}}\n')
+
+    with open(os.path.join(STATIC_DIR, 'background.css'), 'w') as f:
+        f.write(''.join(css))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default=SOURCE, help="image to build from (default: background.jpeg)")
+    parser.add_argument('--widths', default=','.join(map(str, WIDTHS)),
+                        help="comma-separated variant widths in pixels")
+    args = parser.parse_args()
+
+    image = Image.open(args.source).convert('RGB')
+    widths = sorted({min(int(width), image.width) for width in args.widths.split(',') if width.strip()})
+
+    formats = dict(FORMATS)
+    if not features.check('avif'):
+        print("Pillow was built without AVIF support; writing WebP and JPEG only")
+        del formats['avif']
+
+    variants = build_variants(image, widths, formats, os.path.getsize(args.source))
+    build_css(variants, build_placeholder(image))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Leaderboard rotation: past windows' rows are deleted from the top of the
+sheet, and a rotation that lost a race to another process deletes nothing.
+
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bench_stats import import_app  # noqa: E402
+from fake_sheets import FakeSheetsConnection  # noqa: E402
+
+app = import_app()
+
+
+def leaderboard(n_past, n_current, first_id=0):
+    """n_past rows of an old window followed by n_current rows of this one."""
+    now = datetime.now()
+    rows = []
+    for i in range(n_past + n_current):
+        played = now - timedelta(days=30) if i < n_past else now
+        rows.append({
+            'Name': f'Player {first_id + i}',
+            'Score': i % 6,
+            'Time_Taken': 30,
+            'Timestamp': played.strftime('%Y-%m-%d %H:%M:%S'),
+            'Submission_ID': f'id-{first_id + i}',
+            'Window': app.get_window_key(played),
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def fake():
+    fake = FakeSheetsConnection()
+    fake.load('Leaderboard', leaderboard(n_past=5, n_current=3))
+    return fake
+
+
+def test_rotation_deletes_past_windows(fake):
+    ranking = app.LeaderboardRanking()
+    ranking.refresh(app.SheetsStorage(fake))
+
+    assert list(fake.frame('Leaderboard')['Submission_ID']) == ['id-5', 'id-6', 'id-7']
+    assert ranking.rank(0, 60)[1] == 3
+
+
+def test_rotation_skipped_after_another_process_rotated(fake):
+    storage = app.SheetsStorage(fake)
+    other = app.SheetsStorage(fake)
+    raced = []
+
+    def after_race(method):
+        def wrapper(worksheet, n_rows):
+            # Another process rotates between our read and our delete, and a
+            # new score is appended
+            if not raced:
+                raced.append(True)
+                other.delete_first_rows(worksheet, 5)
+                other.append(worksheet, leaderboard(0, 1, first_id=8).to_dict('records'))
+            return method(worksheet, n_rows)
+        return wrapper
+
+    storage.read_first = after_race(storage.read_first)
+    storage.delete_first_rows = after_race(storage.delete_first_rows)
+    ranking = app.LeaderboardRanking()
+    ranking.refresh(storage)
+
+    # Nothing of the current window was deleted, and the ranking matches the sheet
+    assert list(fake.frame('Leaderboard')['Submission_ID']) == ['id-5', 'id-6', 'id-7', 'id-8']
+    assert ranking.rank(0, 60)[1] == 4
+    assert ranking.watermark == 4
+
+
+def test_sqlite_rotation(tmp_path):
+    storage = app.SQLiteStorage(str(tmp_path / 'trivia.db'))
+    storage.synced.set()
+    storage.append('Leaderboard', leaderboard(n_past=5, n_current=3).to_dict('records'))
+
+    ranking = app.LeaderboardRanking()
+    ranking.refresh(storage)
+
+    assert list(storage.read('Leaderboard')['Submission_ID']) == ['id-5', 'id-6', 'id-7']
+    assert ranking.rank(0, 60)[1] == 3
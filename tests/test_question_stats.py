@@ -0,0 +1,121 @@
+"""
+The editors' question stats view (?view=questions): token gate, the live
+quiz set staying hidden until its window closes, and the stats surviving a
+failed reload.
+
+Runs the app with streamlit's AppTest against the fake Sheets connection
+from benchmarks/:
+    python -m pytest -q tests
+"""
+
+import hashlib
+import os
+import sys
+
+import pandas as pd
+import pytest
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bench_stats import import_app  # noqa: E402
+from fake_sheets import FakeSheetsConnection  # noqa: E402
+from load_test import make_questions  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+TOKEN = 'editor-secret'
+N_QUESTIONS = 30
+
+
+def answers_for(question_ids):
+    """One past game per question, answered right."""
+    return pd.DataFrame([{
+        'Submission_ID': f'past-{i}',
+        'Name': f'Player {i}',
+        'Window': '2020-W01-A',
+        'Question_IDs': question_id,
+        'Answers': 'A',
+        'Correct': '1',
+        'Timestamp': '2020-01-01 12:00:00'
+    } for i, question_id in enumerate(question_ids)])
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeSheetsConnection()
+    questions = make_questions(N_QUESTIONS)
+    fake.load('Questions', questions)
+
+    # Same IDs as app.get_question_id()
+    question_ids = [
+        hashlib.sha1(str(q).strip().encode('utf-8')).hexdigest()[:12] for q in questions['Question']
+    ]
+    fake.load('Answers', answers_for(question_ids))
+    fake.question_ids = question_ids
+    monkeypatch.setattr(streamlit, 'connection', lambda *args, **kwargs: fake)
+    streamlit.cache_resource.clear()
+    return fake
+
+
+def run_app(token=None, secret=TOKEN):
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    if secret:
+        at.secrets['editor_token'] = secret
+    at.query_params['view'] = 'questions'
+    if token:
+        at.query_params['token'] = token
+    return at.run()
+
+
+def shows_stats(at):
+    return any('Question Stats' in str(block.value) for block in at.markdown)
+
+
+@pytest.mark.parametrize('token, secret', [
+    (None, TOKEN),          # No token
+    ('wrong', TOKEN),       # Wrong token
+    (TOKEN, None),          # No editor token configured: the view is off
+])
+def test_stats_view_needs_editor_token(fake, token, secret):
+    at = run_app(token, secret)
+    assert not at.exception
+    assert not shows_stats(at)
+    assert not at.dataframe
+    assert any(button.label == 'Start Quiz' for button in at.button)
+
+
+def test_stats_view_hides_live_quiz_set(fake):
+    at = run_app(TOKEN)
+    assert not at.exception
+    assert shows_stats(at)
+
+    live = set()
+    for ids in fake.frame('Quiz_Sets')['Question_IDs']:
+        live.update(ids.split(','))
+    assert live
+
+    shown = set(at.dataframe[0].value['Question_ID'])
+    assert shown
+    assert not shown & live
+    assert shown | live == set(fake.question_ids)
+
+
+def test_failed_full_reload_keeps_stats(fake):
+    app = import_app()
+    storage = app.SheetsStorage(fake)
+    stats = app.QuestionStats()
+    stats.refresh(storage)
+    loaded = stats.table()
+    assert len(loaded) == N_QUESTIONS
+
+    def fail(*args, **kwargs):
+        raise ConnectionError("Sheets unavailable")
+
+    # Due for a full reload, and the read fails
+    fake.worksheet('Answers').batch_get = fail
+    stats.last_refresh = stats.last_full_reload = 0.0
+    with pytest.raises(ConnectionError):
+        stats.refresh(storage)
+    pd.testing.assert_frame_equal(stats.table(), loaded)
@@ -0,0 +1,92 @@
+"""
+Current streaks (current_streaks() and HallOfFameAggregates) against the
+original window-list algorithm kept in benchmarks/reference_stats.py:
+Mon-Thu / Fri-Sun windows, the one-window grace period and the 365-day cap.
+
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import reference_stats  # noqa: E402
+from bench_stats import import_app  # noqa: E402
+from synthetic_history import generate_history  # noqa: E402
+
+app = import_app()
+
+# One "now" per weekday of a week, plus a year boundary
+NOWS = [datetime(2025, 3, 10, 12) + timedelta(days=day) for day in range(7)] + [datetime(2026, 1, 1, 9)]
+
+
+def history(plays):
+    """Global_History frame from (name, date) pairs."""
+    return pd.DataFrame({
+        'Name': [name for name, _ in plays],
+        'Score': 3,
+        'Time_Taken': 30,
+        'Questions_Total': 5,
+        'Date': [date.strftime('%Y-%m-%d') for _, date in plays],
+    })
+
+
+def every_day(name, now, days):
+    return [(name, now - timedelta(days=offset)) for offset in range(days)]
+
+
+def assert_matches_reference(df, now):
+    expected = reference_stats.calculate_all_streaks(df.copy(), now)
+
+    streaks = app.current_streaks(df['Name'], pd.to_datetime(df['Date'], errors='coerce'), now)
+    by_name = dict(zip(expected['Name'], expected['Current_Streak']))
+    assert {name: int(streaks.get(name, 0)) for name in by_name} == by_name
+
+    aggregates = app.HallOfFameAggregates()
+    aggregates.update(df)
+    pd.testing.assert_frame_equal(aggregates.all_streaks(now), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('now', NOWS)
+def test_synthetic_history(now):
+    df = generate_history(3000, 40, days=500, seed=now.day, end=now)
+    assert_matches_reference(df, now)
+
+
+@pytest.mark.parametrize('now', NOWS)
+def test_window_edges_grace_and_cap(now):
+    df = history(
+        # Every day for two years: capped at a year of windows
+        every_day('Daily', now, 730)
+        # Last played in the previous window only: the grace period keeps it
+        + [('Grace', now - timedelta(days=offset)) for offset in range(5, 40, 3)]
+        # Only one play, on each side of a window edge (Thu / Fri, Sun / Mon)
+        + [('Thursday', now - timedelta(days=(now.weekday() - 3) % 7))]
+        + [('Friday', now - timedelta(days=(now.weekday() - 4) % 7))]
+        + [('Sunday', now - timedelta(days=(now.weekday() - 6) % 7 or 7))]
+        # Missed the current and the previous window
+        + [('Lapsed', now - timedelta(days=offset)) for offset in range(10, 60)]
+        # Played only in the future
+        + [('Future', now + timedelta(days=3))]
+    )
+    assert_matches_reference(df, now)
+
+
+def test_reference_cases():
+    # Guards the reference itself: Wednesday 2025-03-12
+    now = datetime(2025, 3, 12, 12)
+    df = history(
+        every_day('Daily', now, 730)
+        + [('Weekend', datetime(2025, 3, 8)), ('Weekend', datetime(2025, 3, 6))]
+        + [('Gap', datetime(2025, 3, 12)), ('Gap', datetime(2025, 3, 3))]
+    )
+    streaks = reference_stats.calculate_all_streaks(df, now).set_index('Name')['Current_Streak']
+    assert streaks['Weekend'] == 2  # Fri-Sun window (grace) and the Mon-Thu before it
+    assert streaks['Gap'] == 1  # This window, but not the last weekend
+    assert 104 <= streaks['Daily'] <= 106  # About a year of two windows a week